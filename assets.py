@@ -0,0 +1,75 @@
+"""
+Registro de imágenes del juego.
+
+Cada imagen se lee del disco, se escala y se convierte al formato de la pantalla (convert/convert_alpha) una sola vez;
+después se reutiliza desde memoria. Lleva la cuenta de lecturas del disco y de aciertos, para poder comprobar que el
+bucle del juego nunca lee archivos.
+"""
+import os
+
+import pygame
+
+
+class Assets:
+    """Imágenes cargadas, escaladas y convertidas una sola vez"""
+
+    def __init__(self, root="images"):
+        """
+        :param root: carpeta de las imágenes
+        """
+        self.root = root
+        self.raw = {}  # nombre -> imagen tal como se leyó del disco
+        self.images = {}  # (nombre, tamaño) -> imagen escalada y convertida
+        self.loads = 0  # Lecturas del disco
+        self.hits = 0  # Imágenes entregadas desde memoria
+        self.misses = 0  # Imágenes que hubo que preparar
+        self.locked = False  # Si es True, leer del disco es un error
+
+    def load(self, name):
+        """Imagen original, leída del disco solo la primera vez"""
+        surf = self.raw.get(name)
+        if surf is None:
+            if self.locked:
+                raise RuntimeError(f"Se intentó leer {name} del disco después de lock()")
+            surf = pygame.image.load(os.path.join(self.root, name))
+            self.loads += 1
+            self.raw[name] = surf
+        return surf
+
+    def image(self, name, size=None):
+        """
+        Imagen lista para dibujar
+        :param name: nombre del archivo dentro de la carpeta de imágenes
+        :param size: tamaño (ancho, alto) al que se escala; por defecto el tamaño original
+        :return: superficie convertida al formato de la pantalla (si ya hay pantalla)
+        """
+        key = (name, size)
+        surf = self.images.get(key)
+        if surf is not None:
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = self.load(name)
+        if size is not None and surf.get_size() != tuple(size):
+            surf = pygame.transform.smoothscale(surf, size)
+        surf = convert(surf)
+        self.images[key] = surf
+        return surf
+
+    def lock(self):
+        """A partir de ahora, cualquier lectura del disco lanza RuntimeError"""
+        self.locked = True
+
+    def stats(self):
+        """Cuenta de lecturas del disco, aciertos y fallos"""
+        return {"loads": self.loads, "hits": self.hits, "misses": self.misses, "images": len(self.images)}
+
+
+def convert(surf):
+    """Convierte una imagen al formato de la pantalla, con alfa si la imagen lo tiene. Sin pantalla no hace nada."""
+    if pygame.display.get_surface() is None:
+        return surf
+    if surf.get_flags() & pygame.SRCALPHA or surf.get_colorkey() is not None:
+        return surf.convert_alpha()
+    return surf.convert()
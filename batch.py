@@ -0,0 +1,207 @@
+"""
+Simulación en lote de muchos jugadores sobre un mismo nivel, con NumPy.
+
+Cada partida es una fila en arreglos de posición, velocidad y estado; un paso de física se aplica a todas a la vez.
+Sirve para probar miles de secuencias de salto por nivel (tiempos de salto, ajuste de dificultad). Las reglas son
+las de sim.Body y los resultados son los mismos que sim.Simulation, paso a paso.
+
+    batch = BatchSimulation(read_level("level_1.csv"))
+    result = batch.run(inputs)  # inputs: arreglo (partidas, pasos) de True/False
+"""
+import numpy as np
+
+from levels import to_kinds
+from sim import (AFTER_ORB_JUMP, COIN, EMPTY, END, GRAVITY, JUMP_AMOUNT, MAX_FALL, ORB, PLATFORM, SPEED, SPIKE,
+                 START, TICK_RATE, TILE, TILE_SIZES, TILES)
+
+SIZE = 32  # Tamaño del jugador
+
+# Las casillas más grandes (End) pueden tocar al jugador desde celdas arriba y a la izquierda de su ventana
+REACH = max([1] + [-(-max(size) // TILE) for size in TILE_SIZES.values()]) - 1
+
+
+def _round(values):
+    """Redondea como pygame.Rect al asignar un número decimal (mitades lejos del cero)"""
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int64)
+
+
+class BatchSimulation:
+    """N partidas de un mismo nivel que avanzan juntas de a un paso fijo"""
+
+    def __init__(self, level, start=START):
+        """
+        :param level: lista de filas con el texto de cada casilla (como sim.read_level) o arreglo de tipos de casilla
+        :param start: posición inicial (centro) del jugador
+        """
+        self.kinds = to_kinds(level)
+        rows, cols = self.kinds.shape
+
+        # Cada moneda tiene un número para saber quién la recogió
+        self.coin_ids = np.full((rows, cols), -1, dtype=np.int32)
+        coin_cells = np.argwhere(self.kinds == COIN)
+        self.coin_ids[coin_cells[:, 0], coin_cells[:, 1]] = np.arange(len(coin_cells))
+        self.coin_count = len(coin_cells)
+
+        # Ancho y alto de cada tipo de casilla
+        self.tile_w = np.full(len(TILES) + 1, TILE, dtype=np.int64)
+        self.tile_h = np.full(len(TILES) + 1, TILE, dtype=np.int64)
+        for kind, (w, h) in TILE_SIZES.items():
+            self.tile_w[kind] = w
+            self.tile_h[kind] = h
+
+        # Columnas con algún End, para saltarse su búsqueda cuando ningún jugador está cerca
+        self.end_columns = np.cumsum(np.concatenate([[0], (self.kinds == END).any(axis=0)]))
+
+        self.start = start
+        self.width = cols * TILE
+        self.height = rows * TILE
+
+        # Celdas a revisar alrededor del jugador, en orden fila por fila (el mismo orden de init_level)
+        self.offsets = [(dr, dc, -1 <= dr <= 2 and -1 <= dc <= 2)
+                        for dr in range(-1 - REACH, 3) for dc in range(-1 - REACH, 3)]
+
+    def _kinds_at(self, row, col):
+        """Tipo de casilla en cada (fila, columna); fuera del nivel es EMPTY"""
+        rows, cols = self.kinds.shape
+        inside = (row >= 0) & (row < rows) & (col >= 0) & (col < cols)
+        kind = self.kinds[np.clip(row, 0, rows - 1), np.clip(col, 0, cols - 1)]
+        return np.where(inside, kind, EMPTY), np.clip(row, 0, rows - 1), np.clip(col, 0, cols - 1)
+
+    def _collide(self, s, yvel):
+        """
+        Colisiones de un eje para todas las partidas activas (como sim.Body.collide)
+        :param s: diccionario con los arreglos de estado de las partidas activas
+        :param yvel: velocidad vertical con la que se llamó collide (0 para el eje X)
+        """
+        r0 = s["top"] // TILE
+        c0 = s["left"] // TILE
+        falling = yvel > 0
+        rising = yvel < 0
+        level = ~falling & ~rising
+
+        # ¿Hay algún End al alcance de alguna partida?
+        first = np.clip(c0 - 1 - REACH, 0, len(self.end_columns) - 1)
+        last = np.clip(c0 + 3, 0, len(self.end_columns) - 1)
+        near_end = (self.end_columns[last] - self.end_columns[first]) > 0
+        any_end = bool(near_end.any())
+
+        for dr, dc, core in self.offsets:
+            if not core and not any_end:
+                continue
+            row = r0 + dr
+            col = c0 + dc
+            kind, crow, ccol = self._kinds_at(row, col)
+            if not core:
+                kind = np.where(kind == END, END, EMPTY)
+            present = kind != EMPTY
+            if not present.any():
+                continue
+
+            tx = col * TILE
+            ty = row * TILE
+            left = s["left"]
+            top = s["top"]
+            hit = (present & (left < tx + self.tile_w[kind]) & (tx < left + SIZE)
+                   & (top < ty + self.tile_h[kind]) & (ty < top + SIZE))
+            if not hit.any():
+                continue
+
+            orb = hit & (kind == ORB) & s["pressed"]
+            s["vel_y"] = np.where(orb, -float(JUMP_AMOUNT), s["vel_y"])
+            s["jump_amount"] = np.where(orb, AFTER_ORB_JUMP, s["jump_amount"])
+
+            s["win"] |= hit & (kind == END)
+            s["died"] |= hit & (kind == SPIKE)
+
+            coin = hit & (kind == COIN)
+            if coin.any():
+                idx = np.flatnonzero(coin)
+                cid = self.coin_ids[crow[idx], ccol[idx]]
+                fresh = ~s["collected"][idx, cid]
+                s["collected"][idx[fresh], cid[fresh]] = True
+                s["coins"][idx[fresh]] += 1
+
+            platform = hit & (kind == PLATFORM)
+            land = platform & falling
+            s["top"] = np.where(land, ty - SIZE, s["top"])
+            s["vel_y"] = np.where(land, 0.0, s["vel_y"])
+            s["on_ground"] |= land
+            s["is_jump"] &= ~land
+
+            s["top"] = np.where(platform & rising, ty + TILE, s["top"])
+
+            wall = platform & level
+            s["vel_x"] = np.where(wall, 0, s["vel_x"])
+            s["left"] = np.where(wall, tx - SIZE, s["left"])
+            s["died"] |= wall
+
+    def run(self, inputs, max_ticks=None):
+        """
+        Juega todas las partidas desde el inicio
+        :param inputs: arreglo (partidas, pasos) de bits de salto; al acabarse se sigue sin saltar
+        :param max_ticks: límite de pasos; por defecto lo necesario para recorrer el nivel
+        :return: diccionario de arreglos con won, died, ticks (paso en que terminó), coins y column
+        """
+        inputs = np.asarray(inputs, dtype=bool)
+        if inputs.ndim == 1:
+            inputs = inputs[None, :]
+        n, length = inputs.shape
+        if max_ticks is None:
+            max_ticks = self.width // SPEED + 2 * TICK_RATE
+
+        x0 = self.start[0] - SIZE // 2
+        y0 = self.start[1] - SIZE // 2
+        state = {
+            "left": np.full(n, x0, dtype=np.int64),
+            "top": np.full(n, y0, dtype=np.int64),
+            "vel_x": np.zeros(n, dtype=np.int64),
+            "vel_y": np.zeros(n),
+            "on_ground": np.zeros(n, dtype=bool),
+            "is_jump": np.zeros(n, dtype=bool),
+            "jump_amount": np.full(n, JUMP_AMOUNT, dtype=np.int64),
+            "died": np.zeros(n, dtype=bool),
+            "win": np.zeros(n, dtype=bool),
+            "fell": np.zeros(n, dtype=bool),
+            "coins": np.zeros(n, dtype=np.int64),
+            "collected": np.zeros((n, self.coin_count), dtype=bool),
+        }
+        ticks = np.zeros(n, dtype=np.int64)
+        active = np.arange(n)
+        gravity = GRAVITY.y
+
+        for tick in range(max_ticks):
+            if not len(active):
+                break
+            s = {key: value[active] for key, value in state.items()}
+            s["pressed"] = inputs[active, tick] if tick < length else np.zeros(len(active), dtype=bool)
+
+            # Física de sim.Body.update
+            s["vel_x"][:] = SPEED
+            s["is_jump"] |= s["pressed"]
+            jump = s["is_jump"] & s["on_ground"]
+            s["vel_y"] = np.where(jump, -s["jump_amount"].astype(float), s["vel_y"])
+            air = ~s["on_ground"]
+            s["vel_y"] = np.where(air, np.minimum(s["vel_y"] + gravity, MAX_FALL), s["vel_y"])
+
+            self._collide(s, np.zeros(len(active)))
+            s["top"] = _round(s["top"] + s["vel_y"])
+            s["on_ground"][:] = False
+            self._collide(s, s["vel_y"].copy())
+
+            # Avance horizontal (la cámara en pantalla) y caída fuera del nivel
+            s["left"] += s["vel_x"]
+            s["fell"] |= s["top"] > self.height
+
+            for key in state:
+                state[key][active] = s[key]
+            ticks[active] = tick + 1
+            done = s["win"] | s["died"] | s["fell"] | (s["left"] >= self.width)
+            active = active[~done]
+
+        return {
+            "won": state["win"],
+            "died": state["died"] | state["fell"],
+            "ticks": ticks,
+            "coins": state["coins"],
+            "column": state["left"] // TILE,
+        }
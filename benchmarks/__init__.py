@@ -0,0 +1,4 @@
+"""
+Pruebas de rendimiento. Se ejecutan desde la carpeta del proyecto, por ejemplo:
+    python -m benchmarks.collision
+"""
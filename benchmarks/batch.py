@@ -0,0 +1,110 @@
+"""
+Compara la simulación en lote (batch.BatchSimulation) con la simulación de un jugador (sim.Simulation): revisa que
+los resultados sean iguales y mide cuántas partidas por segundo avanza cada una.
+
+Las partidas aleatorias mueren pronto y casi nunca tocan un orbe o el End. Por eso también se comparan partidas que
+ganan: la secuencia del solver en niveles del modo sin fin (endless.py) y variantes con un paso cambiado.
+
+    python -m benchmarks.batch
+"""
+import random
+import time
+
+import numpy as np
+
+from batch import BatchSimulation
+from endless import GROUND, LEAD, flat, generate_chunk, playable
+from sim import END, Simulation, read_level
+from solver import Solver
+
+LEVELS = ["level_1.csv", "level_2.csv"]
+RUNS = 2000
+CHECK = 200  # Partidas que también se juegan con la simulación de un jugador
+ENDLESS_LEVELS = 4  # Niveles del modo sin fin con partidas ganadoras
+ENDLESS_CHUNKS = 3  # Trozos de cada uno
+VARIANTS = 100  # Partidas por nivel: la ganadora y variantes con un paso cambiado
+
+
+def random_inputs(rng, runs, ticks):
+    """Rachas aleatorias de salto presionado o suelto"""
+    inputs = np.zeros((runs, ticks), dtype=bool)
+    for i in range(runs):
+        t = 0
+        while t < ticks:
+            length = int(rng.integers(1, 25))
+            inputs[i, t:t + length] = rng.random() < 0.35
+            t += length
+    return inputs
+
+
+def endless_level(rng, chunks):
+    """Nivel del modo sin fin con chunks trozos que se pueden atravesar y un End al final"""
+    parts = [flat(LEAD)]
+    while len(parts) <= chunks:
+        chunk = generate_chunk(rng)
+        if playable(chunk):
+            parts.append(chunk)
+    kinds = np.concatenate(parts + [flat(4)], axis=1)
+    kinds[GROUND - 4, -4] = END
+    return kinds
+
+
+def variants(rng, witness, runs, ticks):
+    """La secuencia ganadora y variantes con un paso invertido en su segunda mitad: llegan lejos, pasan por los
+    orbes y muchas todavía ganan"""
+    inputs = np.zeros((runs, ticks), dtype=bool)
+    inputs[:, :len(witness)] = witness
+    for i in range(1, runs):
+        t = int(rng.integers(len(witness) // 2, len(witness)))
+        inputs[i, t] = not inputs[i, t]
+    return inputs
+
+
+def check(path, level, inputs):
+    """Juega todas las partidas en lote y una por una, y revisa que den lo mismo"""
+    result = BatchSimulation(level).run(inputs)
+    scalar = Simulation(level)
+    for i, row in enumerate(inputs):
+        exp = scalar.run(row)
+        got = {key: result[key][i].item() for key in exp}
+        assert got == exp, (path, i, got, exp)
+    return result
+
+
+def main():
+    rng = np.random.default_rng(1)
+    for path in LEVELS:
+        level = read_level(path)
+        scalar = Simulation(level)
+        batch = BatchSimulation(level)
+        inputs = random_inputs(rng, RUNS, scalar.width // 6 + 120)
+
+        start = time.perf_counter()
+        result = batch.run(inputs)
+        t_batch = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = [scalar.run(row) for row in inputs[:CHECK]]
+        t_scalar = (time.perf_counter() - start) * RUNS / CHECK
+
+        for i, exp in enumerate(expected):
+            got = {key: result[key][i].item() for key in exp}
+            assert got == exp, (path, i, got, exp)
+
+        print(f"{path}: {RUNS} partidas, lote {t_batch:.2f} s, una por una ~{t_scalar:.2f} s "
+              f"(x{t_scalar / t_batch:.1f}); ganadas {int(result['won'].sum())}, "
+              f"paso medio de muerte {result['ticks'][result['died']].mean():.0f}")
+
+    won = 0
+    for seed in range(ENDLESS_LEVELS):
+        level = endless_level(random.Random(seed), ENDLESS_CHUNKS)
+        witness = Solver(level).solve()["inputs"]
+        assert witness is not None, f"sin fin {seed}: el solver no encontró una partida ganadora"
+        result = check(f"sin fin {seed}", level, variants(rng, witness, VARIANTS, len(witness) + 60))
+        assert result["won"][0], f"sin fin {seed}: la partida del solver no gana"
+        won += int(result["won"].sum())
+    print(f"sin fin: {ENDLESS_LEVELS * VARIANTS} partidas iguales en lote y una por una; ganadas {won}")
+
+
+if __name__ == "__main__":
+    main()
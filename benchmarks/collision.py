@@ -0,0 +1,64 @@
+"""
+Compara el costo de las colisiones del jugador: recorrer todos los obstáculos contra consultar la cuadrícula.
+Con la cuadrícula, el costo por consulta debe mantenerse plano aunque el nivel sea cada vez más ancho.
+
+    python -m benchmarks.collision
+"""
+import random
+import timeit
+
+import pygame
+
+from grid import build_grid
+
+ROWS = 18  # Mismo alto que level_1.csv y level_2.csv
+WIDTHS = [150, 1000, 5000, 20000]  # Columnas del nivel sintético
+QUERIES = 2000
+
+
+def synthetic_tiles(columns, density=0.3, seed=1):
+    """Crea sprites sin imagen (solo rect) con un suelo continuo y obstáculos aleatorios encima"""
+    rng = random.Random(seed)
+    tiles = []
+    for row in range(ROWS):
+        for col in range(columns):
+            if row == ROWS - 1 or (row >= ROWS - 5 and rng.random() < density):
+                tile = pygame.sprite.Sprite()
+                tile.rect = pygame.Rect(col * 32, row * 32, 32, 32)
+                tiles.append(tile)
+    return tiles
+
+
+def scan(player, tiles):
+    """Forma original: prueba collide_rect contra cada obstáculo"""
+    return [p for p in tiles if pygame.sprite.collide_rect(player, p)]
+
+
+def indexed(player, grid):
+    """Con cuadrícula: solo prueba los obstáculos de las celdas cercanas"""
+    return [p for p in grid.query(player.rect) if pygame.sprite.collide_rect(player, p)]
+
+
+def main():
+    print(f"{'columnas':>9} {'obstáculos':>11} {'recorrido (us)':>15} {'cuadrícula (us)':>16}")
+    for columns in WIDTHS:
+        tiles = synthetic_tiles(columns)
+        grid = build_grid(tiles)
+        rng = random.Random(2)
+        players = []
+        for _ in range(QUERIES):
+            player = pygame.sprite.Sprite()
+            player.rect = pygame.Rect(rng.randrange(columns * 32 - 32), rng.randrange(ROWS * 32 - 32), 32, 32)
+            players.append(player)
+
+        # Las dos formas deben encontrar exactamente las mismas colisiones y en el mismo orden
+        assert all(scan(p, tiles) == indexed(p, grid) for p in players[:50])
+
+        scan_sample = players[:max(1, QUERIES * 150 // columns)]  # El recorrido completo es muy lento en niveles anchos
+        t_scan = timeit.timeit(lambda: [scan(p, tiles) for p in scan_sample], number=1) / len(scan_sample)
+        t_grid = timeit.timeit(lambda: [indexed(p, grid) for p in players], number=1) / len(players)
+        print(f"{columns:>9} {len(tiles):>11} {t_scan * 1e6:>15.1f} {t_grid * 1e6:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
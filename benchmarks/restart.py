@@ -0,0 +1,96 @@
+"""
+Mide cuánto cuesta reiniciar un nivel: reconstruirlo (grupos de sprites, cuadrícula y trozos precalculados, como
+hacía reset en main.py) o restaurar su estado inicial en el lugar (sim.LevelSnapshot).
+
+    python -m benchmarks.restart
+"""
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from chunks import ChunkCache
+from grid import TileGrid
+from levels import load_level
+from sim import COIN, ORB, START, Body, LevelSnapshot
+
+LEVELS = ["level_1.csv", "level_2.csv"]
+RESTARTS = 200
+
+
+class Sprite(pygame.sprite.Sprite):
+    """Obstáculo como los de main.py: imagen, rectángulo y tipo de casilla"""
+
+    def __init__(self, kind, image, pos, *groups):
+        super().__init__(*groups)
+        self.kind = kind
+        self.image = image
+        self.rect = image.get_rect(topleft=pos)
+
+
+def build(kinds, image):
+    """Lo que hace reset al reconstruir un nivel: jugador, grupo de sprites, cuadrícula y trozos"""
+    elements = pygame.sprite.Group()
+    body = Body(START)
+    rows, cols = kinds.nonzero()
+    for row, col, kind in zip(rows.tolist(), cols.tolist(), kinds[rows, cols].tolist()):
+        Sprite(kind, image, (col * 32, row * 32), elements)
+    grid = TileGrid(32)
+    for sprite in elements:
+        grid.insert(sprite, pygame.Rect(sprite.rect))
+    ChunkCache([sprite for sprite in elements if sprite.kind not in (COIN, ORB)])
+    return body, elements
+
+
+def collect_all(coins):
+    """Recoge todas las monedas, como al jugar un intento"""
+    for sprite in coins:
+        sprite.rect.x = 0
+        sprite.rect.y = 0
+
+
+def timed(function):
+    """Tiempo medio por reinicio (ms) y bloques de memoria que siguen reservados después de los reinicios"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    for _ in range(RESTARTS):
+        function()
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename")
+                 if stat.count_diff > 0 and not stat.traceback[0].filename.endswith("tracemalloc.py"))
+    return elapsed / RESTARTS * 1000, blocks
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    image = pygame.Surface((32, 32))
+    for path in LEVELS:
+        kinds = load_level(path)
+        body, elements = build(kinds, image)
+        state = LevelSnapshot(body, elements)
+        coins = [sprite for sprite in elements if sprite.kind == COIN]
+
+        def rebuild():
+            collect_all(coins)
+            build(kinds, image)
+
+        def restore():
+            collect_all(coins)
+            state.restore()
+
+        rebuild_ms, _ = timed(rebuild)
+        restore_ms, blocks = timed(restore)
+        print(f"{path}: {len(elements)} sprites, reconstruir {rebuild_ms:.3f} ms, restaurar {restore_ms:.4f} ms "
+              f"(x{rebuild_ms / restore_ms:,.0f}), {len(coins)} monedas, "
+              f"{blocks} bloques de memoria nuevos al restaurar")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Mide cómo escala runner.py con la cantidad de procesos: corre los mismos trabajos (secuencias aleatorias en los
+niveles del juego) con 1, 2, 4... procesos, hasta uno por núcleo, y muestra trabajos por segundo y la aceleración
+respecto de un proceso.
+
+    python -m benchmarks.runner
+    python -m benchmarks.runner --jobs 20000 --workers 1 2 4 8
+"""
+import argparse
+import io
+import os
+
+from runner import jobs_from, run
+
+LEVELS = ["level_1.csv", "level_2.csv"]
+JOBS = 4000  # Trabajos en total (repartidos entre los niveles)
+
+
+def sweep(cores):
+    """1, 2, 4... hasta cores, y cores al final si no es potencia de 2"""
+    counts = []
+    n = 1
+    while n < cores:
+        counts.append(n)
+        n *= 2
+    return counts + [cores]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide runner.py con distinta cantidad de procesos")
+    parser.add_argument("--jobs", type=int, default=JOBS)
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="por defecto 1, 2, 4... núcleos")
+    args = parser.parse_args(argv)
+
+    cores = os.cpu_count() or 1
+    counts = args.workers or sweep(cores)
+    print(f"{args.jobs} trabajos, {cores} núcleos")
+    print(f"{'procesos':>8} {'s':>8} {'trabajos/s':>11} {'acelera':>8}")
+    base = None
+    for workers in counts:
+        jobs = jobs_from(LEVELS, args.jobs // len(LEVELS))
+        summary = run(jobs, workers, out=io.StringIO())
+        rate = summary["jobs"] / summary["seconds"]
+        base = base or rate
+        print(f"{workers:>8} {summary['seconds']:>8.2f} {rate:>11,.0f} {rate / base:>7.2f}x", flush=True)
+    if max(counts) > cores:
+        print(f"  aviso: más procesos que núcleos ({cores}); por encima de eso no puede acelerar")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Mide cuántos pasos por segundo avanza la simulación sin ventana (sim.Simulation) en los niveles del juego.
+
+    python -m benchmarks.simulation
+"""
+import random
+import time
+
+from sim import Simulation, read_level
+
+LEVELS = ["level_1.csv", "level_2.csv"]
+RUNS = 200
+
+
+def main():
+    rng = random.Random(1)
+    for path in LEVELS:
+        sim = Simulation(read_level(path))
+        ticks = 0
+        outcomes = {"won": 0, "died": 0}
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            # Entradas aleatorias: rachas de salto presionado o suelto
+            inputs = []
+            while len(inputs) < 2000:
+                inputs += [rng.random() < 0.3] * rng.randint(1, 20)
+            result = sim.run(inputs)
+            ticks += result["ticks"]
+            outcomes["won"] += result["won"]
+            outcomes["died"] += result["died"]
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {ticks} pasos en {elapsed:.2f} s -> {ticks / elapsed:,.0f} pasos/s {outcomes}")
+
+
+if __name__ == "__main__":
+    main()
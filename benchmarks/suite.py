@@ -0,0 +1,189 @@
+"""
+Mide cómo escala el juego completo con el ancho del nivel.
+
+Para cada ancho se genera un nivel sintético (ver synthetic.py) y se juega main.py tal cual, sin ventana (driver
+dummy de SDL), durante un número fijo de fotogramas (un paso de física en cada uno) y sin esperar al reloj. Cada
+nivel corre en su propio proceso, así que la memoria máxima es la de ese nivel. Se reportan fotogramas por segundo,
+tiempo por fotograma (media, p50, p95, p99), tiempo de carga (hasta el primer fotograma) y memoria máxima. Los
+resultados se guardan en JSON para compararlos con corridas posteriores, con el informe de arranque de cada nivel.
+
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import synthetic_level, write_level
+from profiler import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Carpeta del juego
+WIDTHS = [150, 1000, 10000, 100000]  # Columnas de los niveles sintéticos
+DENSITY = 0.1
+FRAMES = 600
+TOLERANCE = 0.10  # Caída de FPS que cuenta como regresión al comparar
+
+
+class _Stop(Exception):
+    pass
+
+
+def peak_memory():
+    """Memoria máxima del proceso en MB (None si el sistema no lo informa)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def play(workdir, frames):
+    """
+    Juega main.py en workdir (que tiene level_1.csv, images y music) con el salto presionado a ratos
+    :return: diccionario con las mediciones
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ.pop("PYDASH_PROFILE", None)
+    import pygame
+    import timestep
+    from sim import TICK_RATE
+
+    ticks = []
+    clock = [0.0]  # Tiempo que ve timestep.FixedTimestep: un paso de física por fotograma, como a 60 FPS
+
+    class Keys:
+        def __getitem__(self, key):
+            return key in (pygame.K_UP, pygame.K_SPACE) and len(ticks) % 45 < 3
+
+    class Clock:
+        """Reloj que no espera: guarda el momento de cada fotograma y termina el juego al llegar a frames"""
+
+        def tick(self, framerate=0):
+            ticks.append(time.perf_counter())
+            if len(ticks) > frames:
+                raise _Stop
+            clock[0] += 1.000001 / TICK_RATE  # Un poco más que un paso, para no perder pasos por redondeo
+            return 0
+
+    space = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)  # Pasa las pantallas de espera
+    pygame.key.get_pressed = lambda: Keys()
+    pygame.event.get = lambda *args, **kwargs: [space]
+    pygame.event.wait = lambda *args, **kwargs: space
+    pygame.mixer_music.load = pygame.mixer_music.play = lambda *args, **kwargs: None
+    pygame.time.Clock = Clock
+    timestep.perf_counter = lambda: clock[0]
+
+    os.chdir(workdir)
+    sys.path.insert(0, ROOT)
+    path = os.path.join(ROOT, "main.py")
+    game = {"__name__": "__main__", "__file__": path}
+    with open(path) as f:
+        code = compile(f.read(), path, "exec")
+    start = time.perf_counter()
+    try:
+        exec(code, game)
+    except _Stop:
+        pass
+
+    times = sorted(b - a for a, b in zip(ticks[1:], ticks[2:]))  # El primer fotograma incluye reset
+    frame_ms = {"mean": sum(times) / len(times) * 1000, "max": times[-1] * 1000}
+    for p in (50, 95, 99):
+        frame_ms[f"p{p}"] = percentile(times, p) * 1000
+    return {
+        "fps": len(times) / sum(times),
+        "frame_ms": frame_ms,
+        "load_s": ticks[0] - start,
+        "startup_ms": game["startup"].stats(),  # Fases del arranque de main.py (ver startup.py)
+        "peak_mb": peak_memory(),
+        "deaths": game.get("attempts"),
+        "column": game["player"].rect.x // 32,
+    }
+
+
+def measure(columns, density, frames):
+    """Genera el nivel, lo juega en otro proceso y devuelve el resultado"""
+    workdir = tempfile.mkdtemp(prefix="pydash-bench-")
+    try:
+        rows = synthetic_level(columns, density)
+        write_level(os.path.join(workdir, "level_1.csv"), rows)
+        for folder in ("images", "music"):
+            try:
+                os.symlink(os.path.join(ROOT, folder), os.path.join(workdir, folder))
+            except OSError:
+                shutil.copytree(os.path.join(ROOT, folder), os.path.join(workdir, folder))
+        out = subprocess.run([sys.executable, "-m", "benchmarks.suite", "--run", workdir, str(frames)], cwd=ROOT,
+                             check=True, capture_output=True, text=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    result.update(columns=columns, density=density, frames=frames,
+                  tiles=sum(cell != "-1" for row in rows for cell in row))
+    return result
+
+
+def key(result):
+    return f"{result['columns']}x{result['density']}"
+
+
+def show(result, old=None):
+    """Imprime un resultado, con el cambio respecto a old si lo hay"""
+    line = (f"{result['columns']:>7} {result['tiles']:>8} {result['fps']:>9.0f} {result['frame_ms']['p50']:>8.2f} "
+            f"{result['frame_ms']['p95']:>8.2f} {result['frame_ms']['p99']:>8.2f} {result['load_s']:>8.2f} "
+            f"{result['peak_mb'] or 0:>8.0f}")
+    if old is not None:
+        line += f"  FPS {result['fps'] / old['fps'] - 1:+.0%}, carga {result['load_s'] / old['load_s'] - 1:+.0%}"
+    print(line, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--widths", type=int, nargs="+", default=WIDTHS, help="columnas de cada nivel")
+    parser.add_argument("--density", type=float, default=DENSITY, help="fracción de celdas con obstáculo")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="fotogramas por nivel")
+    parser.add_argument("--save", help="guarda los resultados en este JSON")
+    parser.add_argument("--compare", help="compara con los resultados guardados en este JSON")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="caída de FPS que es una regresión")
+    parser.add_argument("--run", nargs=2, metavar=("CARPETA", "FOTOGRAMAS"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run:
+        print(json.dumps(play(args.run[0], int(args.run[1]))))
+        return 0
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {key(result): result for result in json.load(f)["results"]}
+
+    print(f"{'columnas':>7} {'casillas':>8} {'FPS':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'carga s':>8} "
+          f"{'MB':>8}")
+    results = []
+    regressions = []
+    for columns in args.widths:
+        result = measure(columns, args.density, args.frames)
+        old = baseline.get(key(result))
+        show(result, old)
+        if result["deaths"]:
+            print(f"  aviso: el jugador murió {result['deaths']} veces; los tiempos incluyen reinicios")
+        if old is not None and result["fps"] < old["fps"] * (1 - args.tolerance):
+            regressions.append(key(result))
+        results.append(result)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": sys.version.split()[0], "platform": sys.platform, "results": results}, f, indent=1)
+    if regressions:
+        print(f"Regresiones de más de {args.tolerance:.0%} en FPS: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
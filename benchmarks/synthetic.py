@@ -0,0 +1,37 @@
+"""
+Niveles sintéticos en el formato CSV de los niveles del juego (el que lee levels.load_level), de cualquier ancho.
+
+Tienen un suelo continuo y obstáculos aleatorios arriba (sobre el alcance del salto) y abajo del suelo, así que el
+jugador los recorre enteros sin morir mientras la cuadrícula, la cámara y el dibujo trabajan con todos ellos.
+"""
+import csv
+import random
+
+ROWS = 18  # Mismo alto que level_1.csv y level_2.csv
+GROUND = 12  # Fila del suelo
+SKY = 4  # Filas de arriba con obstáculos; el jugador empieza debajo de ellas y no salta tan alto
+CELLS = ["0", "Spike", "Coin", "Orb", "T"]
+
+
+def synthetic_level(columns, density=0.1, seed=1):
+    """
+    :param columns: ancho del nivel en casillas
+    :param density: fracción de las celdas fuera del camino del jugador que tienen un obstáculo
+    :return: lista de filas con el texto de cada casilla, como sim.read_level
+    """
+    rng = random.Random(seed)
+    rows = []
+    for row in range(ROWS):
+        if row == GROUND:
+            rows.append(["0"] * columns)
+        elif row < SKY or row > GROUND:
+            rows.append([rng.choice(CELLS) if rng.random() < density else "-1" for _ in range(columns)])
+        else:
+            rows.append(["-1"] * columns)
+    return rows
+
+
+def write_level(path, rows):
+    """Guarda un nivel en CSV"""
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows(rows)
@@ -0,0 +1,63 @@
+"""
+Compara el desvanecimiento del rastro en toda la pantalla (como el juego original) con el desvanecimiento limitado a
+las áreas del rastro (trail.TrailLayer), y revisa que la imagen final sea la misma.
+
+    python -m benchmarks.trail
+"""
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from particles import ParticlePool
+from trail import TrailLayer
+
+SIZE = (800, 600)
+FRAMES = 2000
+
+
+def play(bounded, screen, background):
+    """
+    Dibuja FRAMES fotogramas del rastro de un jugador que salta sobre el fondo
+    :return: (milisegundos por fotograma en desvanecer y dibujar la capa, imagen final)
+    """
+    rng = random.Random(1)
+    layer = TrailLayer(SIZE, bounded)
+    pool = ParticlePool()
+    elapsed = 0.0
+    for frame in range(FRAMES):
+        x, y = 134, 384 - abs((frame % 40) - 20) * 4  # El jugador salta sin moverse en la pantalla
+        screen.blit(background, (0, 0))
+
+        start = time.perf_counter()
+        layer.fade()
+        pool.emit(x - 6, y - 6, rng.randint(0, 25) / 10 - 1, 0, rng.randint(5, 8))
+        pool.step(layer.surf)
+        layer.mark(pool.bounds())
+        if frame % 50 == 0:  # Destello de un orbe de vez en cuando
+            layer.mark(pygame.draw.circle(layer.surf, (255, 255, 0), (x + 200, y - 40), 18))
+        layer.composite(screen)
+        elapsed += time.perf_counter() - start
+    return elapsed / FRAMES * 1000, pygame.surfarray.array3d(screen)
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode(SIZE)
+    background = pygame.Surface(SIZE)
+    background.fill((40, 60, 120))
+
+    full_ms, full = play(False, screen, background)
+    bounded_ms, bounded = play(True, screen, background)
+    diff = int(np.abs(full.astype(int) - bounded).max())
+    print(f"pantalla completa: {full_ms:.3f} ms/fotograma")
+    print(f"solo el rastro:    {bounded_ms:.3f} ms/fotograma (x{full_ms / bounded_ms:.1f})")
+    print(f"diferencia máxima de color entre las dos imágenes: {diff}/255")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Cámara del juego.
+
+Los obstáculos y el jugador viven en coordenadas fijas del mundo; la cámara solo guarda un desplazamiento que se
+aplica al dibujar. Así avanzar la pantalla cuesta lo mismo sin importar cuántos obstáculos tenga el nivel.
+"""
+import pygame
+
+
+class Camera:
+    """Desplazamiento de la vista sobre el mundo"""
+
+    def __init__(self, size, x=0, y=0):
+        """
+        :param size: tamaño de la pantalla (ancho, alto)
+        :param x: desplazamiento horizontal inicial
+        :param y: desplazamiento vertical inicial
+        """
+        self.width, self.height = size
+        self.x = x
+        self.y = y
+
+    def reset(self, x=0, y=0):
+        """Regresa la cámara al inicio del nivel"""
+        self.x = x
+        self.y = y
+
+    def scroll(self, dx, dy=0):
+        """Mueve la cámara dx píxeles a la derecha (y dy hacia abajo)"""
+        self.x += dx
+        self.y += dy
+
+    def between(self, previous, alpha):
+        """
+        Cámara en un punto intermedio entre una posición anterior y la actual, para dibujar entre dos pasos de física
+        :param previous: posición (x, y) del paso anterior
+        :param alpha: 0 es la posición anterior, 1 la actual
+        """
+        x = round(previous[0] + (self.x - previous[0]) * alpha)
+        y = round(previous[1] + (self.y - previous[1]) * alpha)
+        return Camera((self.width, self.height), x, y)
+
+    @property
+    def view(self):
+        """Rectángulo visible en coordenadas del mundo"""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def apply(self, rect):
+        """Convierte un rectángulo del mundo a coordenadas de pantalla"""
+        return rect.move(-self.x, -self.y)
+
+    def draw(self, surf, sprites, doreturn=False):
+        """
+        Dibuja sprites aplicando el desplazamiento de la cámara (reemplaza a Group.draw)
+        :param surf: superficie en la que se dibuja
+        :param sprites: grupo o lista de sprites con image y rect en coordenadas del mundo
+        :param doreturn: si es True, devuelve los rectángulos de pantalla en los que se dibujó
+        """
+        x, y = self.x, self.y
+        return surf.blits([(sprite.image, sprite.rect.move(-x, -y)) for sprite in sprites], doreturn)
@@ -0,0 +1,97 @@
+"""
+Superficies precalculadas para los obstáculos que nunca cambian.
+
+Los bloques, los bloques truco, los picos y el final del nivel siempre se ven igual, así que cada rango de columnas
+del nivel se dibuja una sola vez en una superficie grande (un "trozo"). En cada fotograma se dibujan 2 o 3 trozos en
+vez de cientos de obstáculos pequeños. Los trozos se crean la primera vez que se ven y se descartan los menos usados
+cuando se pasa del presupuesto de memoria.
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class ChunkCache:
+    """Trozos del nivel con los obstáculos estáticos ya dibujados, con descarte LRU por memoria"""
+
+    def __init__(self, sprites, chunk_width=512, budget=16 * 1024 * 1024):
+        """
+        :param sprites: obstáculos estáticos en coordenadas del mundo, en el orden en que se dibujan
+        :param chunk_width: ancho en píxeles de cada trozo (16 columnas por defecto)
+        :param budget: memoria máxima en bytes para los trozos guardados
+        """
+        self.chunk_width = chunk_width
+        self.budget = budget
+        self.sprites = {}  # índice del trozo -> obstáculos que lo tocan
+
+        sprites = list(sprites)
+        self.count = len(sprites)  # Obstáculos estáticos en total
+        self.drawn = 0  # Obstáculos dentro de los trozos dibujados en el último fotograma
+        self.top = min([0] + [sprite.rect.top for sprite in sprites])
+        self.height = max([0] + [sprite.rect.bottom for sprite in sprites]) - self.top
+        for sprite in sprites:
+            # Un obstáculo más grande que su casilla (como End) puede tocar varios trozos
+            for index in range(sprite.rect.left // chunk_width, (sprite.rect.right - 1) // chunk_width + 1):
+                self.sprites.setdefault(index, []).append(sprite)
+
+        self.cache = OrderedDict()  # índice -> superficie, del menos al más usado recientemente
+        self.bytes = 0  # Memoria usada por los trozos guardados
+        self.hits = 0  # Trozos reutilizados
+        self.bakes = 0  # Trozos dibujados
+        self.evictions = 0  # Trozos descartados por el presupuesto
+
+    def bake(self, index):
+        """
+        Dibuja los obstáculos estáticos de un trozo en una superficie nueva.
+        Se usa alfa premultiplicado para que dibujar el trozo dé el mismo resultado que dibujar cada obstáculo.
+        """
+        left = index * self.chunk_width
+        chunk = pygame.Surface((self.chunk_width, self.height), pygame.SRCALPHA)
+        chunk.blits([(sprite.image.premul_alpha(), (sprite.rect.left - left, sprite.rect.top - self.top), None,
+                      pygame.BLEND_PREMULTIPLIED) for sprite in self.sprites.get(index, [])], False)
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert_alpha()  # Formato de la pantalla: dibujarlo no requiere conversión
+        self.bakes += 1
+        return chunk
+
+    def get(self, index):
+        """Devuelve el trozo del índice, creándolo si no está guardado"""
+        chunk = self.cache.get(index)
+        if chunk is not None:
+            self.cache.move_to_end(index)
+            self.hits += 1
+            return chunk
+
+        chunk = self.bake(index)
+        self.cache[index] = chunk
+        self.bytes += chunk.get_width() * chunk.get_height() * chunk.get_bytesize()
+
+        # Descarta los trozos menos usados, sin descartar nunca el que se acaba de crear
+        while self.bytes > self.budget and len(self.cache) > 1:
+            _, old = self.cache.popitem(last=False)
+            self.bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+            self.evictions += 1
+        return chunk
+
+    def draw(self, surf, camera):
+        """
+        Dibuja los trozos que se ven en la cámara
+        :return: número de trozos dibujados
+        """
+        first = int(camera.x) // self.chunk_width
+        last = int(camera.x + camera.width - 1) // self.chunk_width
+        blits = []
+        drawn = set()
+        for index in range(first, last + 1):
+            if index in self.sprites:
+                pos = (index * self.chunk_width - camera.x, self.top - camera.y)
+                blits.append((self.get(index), pos, None, pygame.BLEND_PREMULTIPLIED))
+                drawn.update(map(id, self.sprites[index]))  # End puede estar en dos trozos: se cuenta una vez
+        surf.blits(blits, False)
+        self.drawn = len(drawn)
+        return len(blits)
+
+    def clear(self):
+        """Descarta todos los trozos guardados"""
+        self.cache.clear()
+        self.bytes = 0
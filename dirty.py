@@ -0,0 +1,94 @@
+"""
+Dibujo por rectángulos sucios.
+
+En vez de borrar toda la pantalla con el fondo y enviarla completa con display.flip en cada fotograma, aquí se
+anotan los rectángulos en los que se dibujó. En el fotograma siguiente solo esos rectángulos se borran con el fondo,
+y a la pantalla se envían los de los dos fotogramas (lo que se borró y lo que se dibujó) con display.update. Si lo
+que cambió cubre la mayor parte de la pantalla, se vuelve a display.flip, que en ese caso es más barato.
+
+Sirve cuando el límite es la velocidad de relleno (equipos de poca potencia): el fondo casi no se vuelve a copiar.
+Desactivado, erase borra toda la pantalla y present hace flip, como el juego original.
+"""
+import pygame
+
+CELL = 32  # Tamaño de las celdas con que se estima qué parte de la pantalla cambió
+
+
+class DirtyRects:
+    """Rectángulos de pantalla dibujados en cada fotograma"""
+
+    def __init__(self, size, enabled=True, full_ratio=0.5):
+        """
+        :param size: tamaño de la pantalla (ancho, alto)
+        :param enabled: si es False, cada fotograma se borra y se envía completo
+        :param full_ratio: fracción de la pantalla cambiada a partir de la cual se usa display.flip
+        """
+        self.enabled = enabled
+        self.full_ratio = full_ratio
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.cols = -(-size[0] // CELL)
+        self.rows = -(-size[1] // CELL)
+        self.current = []  # Rectángulos dibujados en este fotograma
+        self.previous = []  # Rectángulos dibujados en el fotograma anterior; se borran en este
+        self.full = True  # ¿Hay que borrar y enviar toda la pantalla en este fotograma?
+        self.frames = 0
+        self.full_frames = 0
+        self.rects = 0  # Rectángulos enviados con display.update
+
+    def invalidate(self):
+        """La pantalla se dibujó por otro lado (por ejemplo, la pantalla de muerte): el próximo fotograma es completo"""
+        self.full = True
+
+    def add(self, rect):
+        """Anota un rectángulo de pantalla en el que se dibujó en este fotograma"""
+        if self.enabled:
+            rect = self.screen_rect.clip(rect)
+            if rect.width and rect.height:
+                self.current.append(rect)
+
+    def extend(self, rects):
+        """Anota varios rectángulos (por ejemplo, lo que devuelve Surface.blits)"""
+        if self.enabled:
+            for rect in rects:
+                self.add(rect)
+
+    def stale(self, rect):
+        """Anota un rectángulo en el que se dibujó antes de erase; se borra y se envía en este mismo fotograma"""
+        if self.enabled:
+            self.previous.append(self.screen_rect.clip(rect))
+
+    def erase(self, surf, background):
+        """Borra con el fondo lo dibujado en el fotograma anterior (o toda la pantalla)"""
+        if self.full or not self.enabled:
+            surf.blit(background, (0, 0))
+        else:
+            surf.blits([(background, rect, rect) for rect in self.previous], False)
+
+    def coverage(self, rects):
+        """Fracción aproximada de la pantalla que cubren los rectángulos, contando celdas de CELL píxeles"""
+        cells = set()
+        for rect in rects:
+            for col in range(rect.left // CELL, (rect.right - 1) // CELL + 1):
+                for row in range(rect.top // CELL, (rect.bottom - 1) // CELL + 1):
+                    cells.add(col * self.rows + row)
+        return len(cells) / (self.cols * self.rows)
+
+    def present(self):
+        """Envía a la ventana lo que cambió en este fotograma"""
+        self.frames += 1
+        rects = self.previous + self.current
+        if not self.enabled or self.full or self.coverage(rects) > self.full_ratio:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(rects)
+            self.rects += len(rects)
+        self.previous = self.current
+        self.current = []
+        self.full = False
+
+    def stats(self):
+        """Fotogramas, fotogramas completos y rectángulos enviados por fotograma parcial"""
+        partial = self.frames - self.full_frames
+        return {"frames": self.frames, "full_frames": self.full_frames,
+                "rects_per_frame": self.rects / partial if partial else 0.0}
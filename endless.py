@@ -0,0 +1,326 @@
+"""
+Modo sin fin.
+
+Las columnas del nivel se generan al azar en trozos de CHUNK_COLUMNS columnas con las mismas casillas de los niveles
+(bloques, picos, monedas, orbes y bloques falsos). Cada trozo empieza y termina con suelo libre, y antes de
+publicarlo se comprueba con solver.Solver, con la física de sim.py, que se puede atravesar; si no, se descarta y se
+genera otro.
+
+La generación corre en otro proceso, varias pantallas por delante de la cámara: los trozos terminados esperan en
+una cola de tamaño fijo, y cuando está llena el proceso espera. En un hilo, el solver (Python puro) se quedaría con
+el GIL y le quitaría tiempo a los fotogramas. El juego toma los trozos de la cola sin esperar nunca; si la cola está
+vacía, esas columnas quedan solo con suelo.
+
+EndlessLevel se comporta como el arreglo de tipos de casilla de un nivel (forma y recortes de columnas), así que
+streaming.LevelStream lo carga por columnas como a cualquier nivel largo. Cada intento recorre el mismo camino desde
+el principio, y el camino se alarga a medida que se necesita.
+
+    python endless.py --chunks 20 --seed 1  # genera trozos sin ventana y muestra las métricas
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import random
+import sys
+from time import perf_counter
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # El proceso generador importa pygame (por sim.py) de nuevo
+
+from sim import AFTER_ORB_JUMP, COIN, END, JUMP_AMOUNT, ORB, PLATFORM, SPIKE, TILE, TRICK
+from solver import Solver
+
+ROWS = 18  # Mismo alto que level_1.csv y level_2.csv
+GROUND = 15  # Primera fila del suelo
+FLOOR = GROUND - 1  # Fila de los obstáculos apoyados en el suelo
+CHUNK_COLUMNS = 48  # Columnas de cada trozo (unas dos pantallas); múltiplo de FILL
+RUNWAY = 4  # Columnas de suelo libre al principio y al final de cada trozo
+LEAD = 12  # Columnas de suelo al principio del nivel: el jugador aparece en el aire y cae sobre ellas
+MAX_PIECE = 7  # Columnas que ocupa como máximo un obstáculo
+FILL = 3  # Las columnas de relleno van de a 3 (96 píxeles, 16 pasos): cada trozo empieza en la misma fase del paso
+WIDTH = 1 << 40  # Ancho del nivel sin fin (solo se usa para ordenar las casillas fila por fila)
+MAX_STATES = 50_000  # Límite de estados del solver por trozo; si no alcanza, el trozo se descarta
+START_TIMEOUT = 10.0  # Segundos que se espera el primer trozo (iniciar el proceso y generarlo); si no, suelo
+
+
+def _spikes(kinds, col, rng):
+    """Uno o dos picos en el suelo (tres no se alcanzan a saltar con el salto bajo de después de un orbe)"""
+    width = rng.randint(1, 2)
+    kinds[FLOOR, col:col + width] = SPIKE
+    return width
+
+
+def _step(kinds, col, rng):
+    """Bloques para subirse, a veces con un escalón más alto o un pico encima, y una moneda.
+    Dos de alto solo se alcanzan desde un escalón."""
+    width = rng.randint(2, 6)
+    kinds[FLOOR, col:col + width] = PLATFORM
+    height = 1
+    if width >= 5 and rng.random() < 0.4:
+        kinds[FLOOR - 1, col + 3:col + width] = PLATFORM
+        height = 2
+    elif width >= 4 and rng.random() < 0.4:
+        kinds[FLOOR - 1, col + width // 2] = SPIKE
+    if rng.random() < 0.5:
+        kinds[GROUND - height - 3, col + rng.randrange(width)] = COIN
+    return width
+
+
+def _orb_pit(kinds, col, rng):
+    """Una fila de picos demasiado larga para un salto, con un orbe encima para saltar de nuevo en el aire"""
+    width = rng.randint(4, MAX_PIECE)
+    kinds[FLOOR, col:col + width] = SPIKE
+    kinds[FLOOR - 2, col + rng.randint(0, 2)] = ORB  # Más arriba no lo alcanza el salto bajo
+    return width
+
+
+def _trick(kinds, col, rng):
+    """Una pared de bloques falsos, que se atraviesan"""
+    kinds[GROUND - rng.randint(1, 3):GROUND, col] = TRICK
+    return 1
+
+
+def _coins(kinds, col, rng):
+    """Monedas en el aire, al alcance de un salto"""
+    width = rng.randint(1, 3)
+    kinds[FLOOR - rng.randint(1, 2), col:col + width] = COIN
+    return width
+
+
+PIECES = [_spikes, _step, _orb_pit, _trick, _coins]
+WEIGHTS = [4, 3, 1, 1, 1]
+
+
+def flat(columns):
+    """Columnas con solo suelo"""
+    kinds = np.zeros((ROWS, columns), dtype=np.int8)
+    kinds[GROUND:] = PLATFORM
+    return kinds
+
+
+def generate_chunk(rng, columns=CHUNK_COLUMNS):
+    """
+    Genera un trozo al azar: obstáculos separados por cuatro a siete columnas de suelo, con RUNWAY columnas libres al
+    principio y al final
+    :param rng: random.Random
+    :return: arreglo (ROWS, columns) de tipos de casilla
+    """
+    kinds = flat(columns)
+    col = RUNWAY
+    while col + MAX_PIECE + RUNWAY <= columns:
+        piece = rng.choices(PIECES, WEIGHTS)[0]
+        col += piece(kinds, col, rng) + rng.randint(4, 7)
+    return kinds
+
+
+def playable(chunk, max_states=MAX_STATES):
+    """
+    ¿Se puede atravesar un trozo? Se prueba con el solver sobre un nivel con LEAD columnas de suelo, el trozo y un
+    End al final, entrando al trozo corriendo por el suelo. En el suelo, onGround se alterna en cada paso y solo se
+    puede saltar cuando es True: según cuándo aterrizó, el jugador llega en una u otra fase. Y después del primer
+    orbe los saltos son más bajos (AFTER_ORB_JUMP). Se prueban las cuatro combinaciones.
+    """
+    columns = chunk.shape[1]
+    level = flat(LEAD + columns + 4)
+    level[:, LEAD:LEAD + columns] = chunk
+    level[GROUND - 4, LEAD + columns] = END  # Mide casi 4 filas: lo toca el jugador que corre por el suelo
+
+    solver = Solver(level, max_states)
+    sim = solver.sim
+    while sim.body.rect.left < (LEAD - 1) * TILE:  # Cae y corre hasta el borde del trozo
+        sim.step(False)
+    state = sim.body.snapshot()
+    entries = [state[:4] + (on_ground,) + state[5:6] + (jump,) + state[7:]
+               for on_ground in (False, True) for jump in (JUMP_AMOUNT, AFTER_ORB_JUMP)]
+    return all(solver.search(entry, sim.tick) is not None for entry in entries)
+
+
+def make_chunk(rng, columns, generated, rejected):
+    """
+    Genera trozos hasta que uno se pueda atravesar
+    :param generated: multiprocessing.Value con los trozos publicados (se suma uno)
+    :param rejected: multiprocessing.Value con los trozos descartados
+    """
+    while True:
+        chunk = generate_chunk(rng, columns)
+        if playable(chunk):
+            generated.value += 1
+            return chunk
+        rejected.value += 1
+
+
+def _generate(seed, columns, chunks, ready, stopped, generated, rejected, busy):
+    """Cuerpo del proceso de ChunkWorker: genera trozos y los deja en la cola hasta que se detenga"""
+    chunks.cancel_join_thread()  # Al detenerse, los trozos que no se tomaron se pierden sin esperar
+    rng = random.Random(seed)
+    while not stopped.is_set():
+        start = perf_counter()
+        chunk = make_chunk(rng, columns, generated, rejected)
+        busy.value += perf_counter() - start
+        while not stopped.is_set():
+            try:
+                chunks.put(chunk, timeout=0.1)
+            except queue.Full:
+                continue  # La cámara todavía no llega: se espera
+            with ready.get_lock():
+                ready.value += 1
+            break
+
+
+class ChunkWorker:
+    """Proceso que genera trozos comprobados y los deja en una cola de tamaño fijo"""
+
+    def __init__(self, seed=None, depth=4, columns=CHUNK_COLUMNS):
+        """
+        :param seed: semilla del generador; None para un camino distinto cada vez
+        :param depth: trozos que se generan por delante (tamaño de la cola)
+        :param columns: columnas de cada trozo
+        """
+        context = multiprocessing.get_context("spawn")  # Sin fork: el juego ya tiene hilos y SDL iniciado
+        self.seed = seed
+        self.depth = depth
+        self.columns = columns
+        self.rng = random.Random(seed)  # Para make, en este proceso
+        self.queue = context.Queue(depth)
+        self.ready = context.Value("i", 0)  # Trozos en la cola (Queue.qsize no existe en macOS)
+        self.stopped = context.Event()
+        self.generated = context.Value("i", 0)  # Trozos publicados
+        self.rejected = context.Value("i", 0)  # Trozos descartados porque no se podían atravesar
+        self.busy = context.Value("d", 0.0)  # Segundos generando y comprobando
+        self.process = context.Process(target=_generate, name="endless", daemon=True,
+                                       args=(seed, columns, self.queue, self.ready, self.stopped, self.generated,
+                                             self.rejected, self.busy))
+
+    def start(self):
+        self.process.start()
+        return self
+
+    def stop(self):
+        """Detiene el proceso (el trozo que estaba generando se pierde)"""
+        self.stopped.set()
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()  # Está en medio de un trozo que tarda: no hace falta esperarlo
+            self.process.join()
+
+    def make(self):
+        """Genera un trozo en este proceso, sin la cola"""
+        return make_chunk(self.rng, self.columns, self.generated, self.rejected)
+
+    def take(self, timeout=0.0):
+        """
+        Un trozo terminado
+        :param timeout: segundos que se espera como máximo si la cola está vacía; 0 no espera nunca
+        :return: el trozo, o None si no llegó a tiempo o el proceso terminó
+        """
+        deadline = perf_counter() + timeout
+        while True:
+            remaining = deadline - perf_counter()
+            try:
+                chunk = self.queue.get(remaining > 0, min(max(remaining, 0.0), 0.1))
+            except queue.Empty:
+                if remaining <= 0 or not self.process.is_alive():
+                    return None
+                continue
+            with self.ready.get_lock():
+                self.ready.value -= 1
+            return chunk
+
+    def stats(self):
+        """Trozos generados y descartados, columnas por segundo de generación y trozos en la cola"""
+        generated, busy = self.generated.value, self.busy.value
+        return {"chunks": generated, "rejected": self.rejected.value, "busy_s": busy,
+                "columns_per_s": generated * self.columns / busy if busy else 0.0, "depth": self.ready.value}
+
+
+class EndlessLevel:
+    """Nivel sin fin para streaming.LevelStream: un arreglo (filas, columnas) de tipos de casilla que se alarga con
+    los trozos de un ChunkWorker"""
+
+    def __init__(self, worker, wait=0.0, first_wait=START_TIMEOUT):
+        """
+        :param worker: generador ya iniciado
+        :param wait: segundos que se espera un trozo si la cola está vacía antes de poner suelo en su lugar. Con 0 el
+        juego nunca espera, pero el camino depende de la velocidad de la máquina; con una semilla conviene esperar,
+        para que el camino sea siempre el mismo
+        :param first_wait: segundos que se espera el primer trozo (al cargar el nivel, no al jugar: incluye iniciar
+        el proceso)
+        """
+        self.worker = worker
+        self.wait = wait
+        self.shape = (ROWS, WIDTH)
+        self.parts = [flat(LEAD)]  # Trozos en orden; sus columnas ya no cambian
+        self.starts = [0]  # Primera columna de cada trozo
+        self.length = LEAD  # Columnas generadas
+        self.starved = 0  # Columnas que quedaron solo con suelo porque el trozo no llegó a tiempo
+        self.lowest = worker.depth  # Menor cantidad de trozos en la cola al tomar uno
+        self._append(worker.take(first_wait), worker.columns)
+
+    def _append(self, part, columns):
+        """Agrega un trozo, o columns columnas de suelo si no llegó (part es None)"""
+        if part is None:
+            part = flat(columns)
+            self.starved += columns
+        self.parts.append(part)
+        self.starts.append(self.length)
+        self.length += part.shape[1]
+
+    def _extend(self, end):
+        """Agrega trozos de la cola (o suelo, si no llegan a tiempo) hasta tener end columnas"""
+        while self.length < end:
+            self.lowest = min(self.lowest, self.worker.ready.value)
+            self._append(self.worker.take(self.wait), -((self.length - end) // FILL) * FILL)
+
+    def __getitem__(self, key):
+        """Columnas start a end - 1 (solo recortes de la forma [:, start:end])"""
+        rows, cols = key
+        start, end = cols.start, cols.stop
+        self._extend(end)
+        first = max(np.searchsorted(self.starts, start, side="right") - 1, 0)
+        pieces = []
+        for part, offset in zip(self.parts[first:], self.starts[first:]):
+            if offset >= end:
+                break
+            pieces.append(part[rows, max(start - offset, 0):end - offset])
+        return np.concatenate(pieces, axis=1)
+
+    def stats(self):
+        """Métricas del generador y del nivel: columnas generadas, columnas sin trozo y profundidad de la cola"""
+        stats = self.worker.stats()
+        stats.update({"columns": self.length, "starved": self.starved, "lowest_depth": self.lowest})
+        return stats
+
+    def report(self):
+        """Resumen de stats en una línea"""
+        s = self.stats()
+        return (f"sin fin: {s['chunks']} trozos ({s['rejected']} descartados), {s['columns_per_s']:,.0f} columnas/s, "
+                f"cola {s['depth']} (mínimo {s['lowest_depth']}), {s['starved']} columnas sin trozo"
+                + (" (el camino no es el de la semilla)" if s["starved"] else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera trozos del modo sin fin y mide la generación")
+    parser.add_argument("--chunks", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--show", action="store_true", help="muestra cada trozo como texto")
+    args = parser.parse_args(argv)
+
+    worker = ChunkWorker(args.seed)
+    start = perf_counter()
+    for _ in range(args.chunks):
+        chunk = worker.make()
+        if args.show:
+            for row in chunk:
+                print("".join(".#^cotE"[kind] for kind in row))
+            print()
+    seconds = perf_counter() - start
+    generated, rejected = worker.generated.value, worker.rejected.value
+    print(f"{generated} trozos ({rejected} descartados) en {seconds:.2f} s: "
+          f"{generated * worker.columns / seconds:,.0f} columnas/s, {seconds / generated * 1000:.1f} ms por trozo")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
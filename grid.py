@@ -0,0 +1,91 @@
+"""
+Índice espacial en cuadrícula para los obstáculos del nivel.
+
+Los niveles están hechos de casillas de 32x32 píxeles, así que cada obstáculo se guarda en las celdas que cubre
+su rectángulo. Para saber con qué puede chocar el jugador basta con mirar las pocas celdas alrededor de su
+rectángulo, en vez de recorrer todos los obstáculos del nivel.
+"""
+import pygame
+
+
+class TileGrid:
+    """Cuadrícula de celdas (columna, fila) que guarda los sprites del nivel en coordenadas del mundo."""
+
+    def __init__(self, cell_size=32):
+        """
+        :param cell_size: tamaño en píxeles de cada celda; por defecto el tamaño de los bloques
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # (columna, fila) -> lista de (orden, sprite)
+        self.count = 0  # Número de sprites en la cuadrícula
+        self.order = 0  # Orden que recibe el próximo sprite insertado
+
+    def __len__(self):
+        return self.count
+
+    def insert(self, sprite, rect=None, order=None):
+        """
+        Agrega un sprite a todas las celdas que cubre su rectángulo
+        :param sprite: obstáculo a indexar
+        :param rect: rectángulo en coordenadas del mundo; por defecto sprite.rect
+        :param order: orden en que query devuelve el sprite; por defecto el orden de inserción
+        """
+        rect = sprite.rect if rect is None else rect
+        if order is None:
+            order = self.order
+            self.order += 1
+        entry = (order, sprite)
+        self.count += 1
+
+        size = self.cell_size
+        for col in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                self.cells.setdefault((col, row), []).append(entry)
+
+    def remove(self, sprite, rect):
+        """
+        Quita un sprite de la cuadrícula
+        :param rect: el mismo rectángulo con el que se insertó
+        """
+        size = self.cell_size
+        cells = self.cells
+        for col in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                bucket = [entry for entry in cells.get((col, row), ()) if entry[1] is not sprite]
+                if bucket:
+                    cells[(col, row)] = bucket
+                else:
+                    cells.pop((col, row), None)
+        self.count -= 1
+
+    def query(self, rect, margin=1):
+        """
+        Devuelve los sprites de las celdas que cubre el rectángulo, en el mismo orden en que se insertaron
+        (el mismo orden en que se recorría el grupo de sprites completo).
+        :param rect: rectángulo en coordenadas del mundo
+        :param margin: celdas extra alrededor del rectángulo; cubre los ajustes que hace collide al jugador
+        :return: lista de sprites candidatos a colisión
+        """
+        size = self.cell_size
+        cells = self.cells
+        found = {}
+        for col in range(rect.left // size - margin, (rect.right - 1) // size + margin + 1):
+            for row in range(rect.top // size - margin, (rect.bottom - 1) // size + margin + 1):
+                bucket = cells.get((col, row))
+                if bucket:
+                    for order, sprite in bucket:
+                        found[order] = sprite
+        return [found[order] for order in sorted(found)]
+
+
+def build_grid(sprites, cell_size=32):
+    """
+    Construye una cuadrícula con todos los sprites de un grupo
+    :param sprites: grupo o lista de sprites con atributo rect
+    :param cell_size: tamaño de celda en píxeles
+    :rtype: TileGrid
+    """
+    grid = TileGrid(cell_size)
+    for sprite in sprites:
+        grid.insert(sprite, pygame.Rect(sprite.rect))
+    return grid
@@ -0,0 +1,116 @@
+"""
+Niveles compilados.
+
+Leer un nivel CSV significa separar miles de celdas de texto y compararlas con los nombres de cada casilla. Aquí cada
+CSV se compila una vez a un arreglo de NumPy con el tipo de cada casilla (los códigos de sim.py) y se guarda como
+.npy en la carpeta LEVEL_CACHE. Cargar un nivel es leer (o mapear en memoria) ese archivo, y dentro del proceso el
+arreglo se guarda por ruta y fecha de modificación, así que reiniciar un nivel no vuelve a leer el disco.
+
+El arreglo tiene forma (filas, columnas), un byte por casilla, y se usa directamente para las colisiones
+(sim.Simulation, batch.BatchSimulation) y para crear los sprites del nivel (init_level).
+
+    python levels.py level_1.csv level_2.csv
+"""
+import csv
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from sim import EMPTY, TILES
+
+LEVEL_CACHE = "__levels__"  # Carpeta de los niveles compilados
+FORMAT = 1  # Versión de los códigos de casilla; cambia el nombre de los archivos compilados
+
+_loaded = {}  # ruta absoluta -> (fecha de modificación, arreglo)
+
+
+def to_kinds(level):
+    """
+    Convierte un nivel en filas de texto (como sim.read_level) al arreglo de tipos de casilla.
+    Las celdas desconocidas quedan vacías, igual que en el juego.
+    """
+    if isinstance(level, np.ndarray):
+        return level.astype(np.int8, copy=False)
+    cols = max(len(row) for row in level)
+    kinds = np.full((len(level), cols), EMPTY, dtype=np.int8)
+    for y, row in enumerate(level):
+        kinds[y, :len(row)] = [TILES.get(cell, EMPTY) for cell in row]
+    return kinds
+
+
+def compiled_path(path):
+    """Ruta del archivo compilado de un nivel CSV"""
+    folder, name = os.path.split(os.path.abspath(path))
+    return os.path.join(folder, LEVEL_CACHE, f"{os.path.splitext(name)[0]}.v{FORMAT}.npy")
+
+
+def read_kinds(path):
+    """
+    Lee un nivel CSV directamente como arreglo de tipos de casilla, fila por fila: nunca tiene en memoria más
+    que el texto de una fila, aunque el nivel sea muy largo
+    """
+    with open(path, newline='') as csvfile:
+        rows = [to_kinds([row])[0] for row in csv.reader(csvfile, delimiter=',', quotechar='"')]
+    kinds = np.full((len(rows), max(len(row) for row in rows)), EMPTY, dtype=np.int8)
+    for y, row in enumerate(rows):
+        kinds[y, :len(row)] = row
+    return kinds
+
+
+def compile_level(path):
+    """
+    Compila un nivel CSV a .npy
+    :return: ruta del archivo compilado
+    """
+    out = compiled_path(path)
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    # Cada proceso escribe en su propio archivo temporal y lo renombra de una vez: si dos procesos compilan el mismo
+    # nivel a la vez, el último reemplazo gana, y ninguno lee ni pisa un archivo a medio escribir
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", prefix=os.path.basename(out) + ".", dir=os.path.dirname(out))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, read_kinds(path))
+        os.replace(tmp, out)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return out
+
+
+def load_level(path, mmap=True):
+    """
+    Carga un nivel como arreglo de tipos de casilla, compilándolo si el CSV cambió
+    :param path: nivel CSV (o un .npy ya compilado)
+    :param mmap: si es True, el archivo se mapea en memoria en vez de copiarse
+    :return: arreglo de solo lectura (filas, columnas) de int8
+    """
+    key = os.path.abspath(path)
+    mtime = os.stat(key).st_mtime_ns
+    cached = _loaded.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    if key.endswith(".npy"):
+        source = key
+    else:
+        source = compiled_path(key)
+        if not os.path.exists(source) or os.stat(source).st_mtime_ns < mtime:
+            source = compile_level(key)
+    kinds = np.load(source, mmap_mode="r" if mmap else None)
+    if not mmap:
+        kinds.flags.writeable = False
+    _loaded[key] = (mtime, kinds)
+    return kinds
+
+
+def main(argv=None):
+    for path in (sys.argv[1:] if argv is None else argv):
+        out = compile_level(path)
+        kinds = load_level(path)
+        print(f"{path} -> {out}: {kinds.shape[0]}x{kinds.shape[1]} casillas, {os.path.getsize(out)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,38 @@
 """
 CONTROLES
 En cualquier lugar -> ESC: salir
-Menú principal -> 1: nivel anterior. 2: siguiente nivel. SPACE: iniciar juego.
+Menú principal -> 1: nivel 1. 2: nivel 2. 3: modo sin fin. SPACE: iniciar juego.
 Juego -> SPACE/UP: saltar y activar el orbe.
     Orbe: salto en el aire cuando se activa
 Si mueres o completas el nivel, presiona SPACE para reiniciar o pasar al siguiente nivel
 """
-import csv
+import math
 import os
 import random
-import pygame
-from pygame.math import Vector2
-from pygame.draw import rect
+from time import perf_counter
 
-# Inicializa el módulo pygame
-pygame.init()
+STARTED = perf_counter()  # Comienzo del arranque, antes de importar pygame (ver el informe de startup.py)
 
-# Crea una pantalla de tamaño 800 x 600 píxeles
-screen = pygame.display.set_mode([800, 600])
+import pygame
+from pygame.draw import rect
+from assets import Assets
+from camera import Camera
+from chunks import ChunkCache
+from dirty import DirtyRects
+from endless import ChunkWorker, EndlessLevel
+from grid import TileGrid
+from levels import load_level
+from particles import ParticlePool
+from profiler import FrameProfiler
+from render import CulledRenderer
+from replay import Recorder, Replay
+from rotation import RotationCache
+from startup import StartupTimer
+from timestep import FixedTimestep, interpolate
+from trail import TrailLayer
+from streaming import LevelStream
+from text import TextCache
+from sim import Body, LevelSnapshot, SPEED, TICK_RATE, COIN, END, ORB, PLATFORM, SPIKE, TRICK
 
 # Controla el bucle principal del juego
 done = False
@@ -25,9 +40,6 @@ done = False
 # Controla si el juego inicia desde el menú principal
 start = False
 
-# Establece la tasa de fotogramas del programa
-clock = pygame.time.Clock()
-
 """
 CONSTANTES
 """
@@ -39,14 +51,33 @@ BLUE = (0, 0, 255)
 
 # Función lambda para generar un color aleatorio
 color = lambda: tuple([random.randint(0, 255) for i in range(3)])
-GRAVITY = Vector2(0, 0.86)  # Vector de gravedad para el jugador
+BAKE_LEVEL = True  # Dibuja los obstáculos estáticos en trozos precalculados en vez de uno por uno
+CHUNK_BUDGET = 16 * 1024 * 1024  # Memoria máxima (bytes) para los trozos precalculados
+ROTATION_STEP = 1  # Grados entre las rotaciones guardadas del jugador
+DIRTY_RECTS = False  # Envía a la ventana solo lo que cambió (ver dirty.py); para equipos de poca potencia
+BOUNDED_TRAIL = True  # Desvanece y dibuja alpha_surf solo donde está el rastro, no la pantalla completa (ver trail.py)
+STREAM_COLUMNS = 1000  # Los niveles más anchos que esto se cargan por columnas a medida que avanza la cámara
+PROFILE = bool(os.environ.get("PYDASH_PROFILE"))  # Mide el tiempo de cada fase del fotograma (F3 muestra el resumen)
+PROFILE_DUMP = os.environ.get("PYDASH_PROFILE", "")  # Archivo .csv o .json donde se guardan los tiempos al salir
+RECORD_FOLDER = os.environ.get("PYDASH_RECORD")  # Carpeta donde se graba cada intento (ver replay.py)
+REPLAY = os.environ.get("PYDASH_REPLAY")  # Repetición que se muestra en vez de leer el teclado
+REPLAY_SPEED = float(os.environ.get("PYDASH_REPLAY_SPEED", 1))  # Múltiplo de la velocidad normal; 0 = sin límite
+FRAME_RATE = 60  # Fotogramas por segundo como máximo; la física va aparte, a sim.TICK_RATE pasos por segundo
+MAX_FRAME_STEPS = 5  # Pasos de física por fotograma como máximo (ver timestep.py); más allá, el juego se hace lento
+ENDLESS = "endless"  # Nombre del nivel sin fin en la lista de niveles (ver endless.py)
+ENDLESS_AHEAD = 4  # Trozos del nivel sin fin que se generan por delante de la cámara
+ENDLESS_SEED = os.environ.get("PYDASH_ENDLESS_SEED")  # Semilla del nivel sin fin (el mismo camino); si no, al azar
+ENDLESS_WAIT = 1.0  # Con semilla, segundos que se espera un trozo atrasado en vez de poner suelo (sin semilla, 0)
+IDLE_TIMEOUT = 1000  # Milisegundos máximos que se duerme esperando una tecla en los menús antes de revisar de nuevo
+SCREEN_SIZE = (800, 600)  # Tamaño de la ventana en píxeles
 
 """
 Clase principal para el jugador
 """
 
-class Player(pygame.sprite.Sprite):
-    """Clase que representa al jugador. Contiene métodos de actualización, variables de victoria y muerte, colisiones y más."""
+class Player(Body, pygame.sprite.Sprite):
+    """Clase que representa al jugador. La física (actualización, colisiones, victoria y muerte) está en sim.Body;
+    aquí se agrega lo que se dibuja en pantalla."""
     win: bool
     died: bool
 
@@ -58,116 +89,43 @@ class Player(pygame.sprite.Sprite):
         :param pos: posición inicial del jugador
         :param groups: acepta cualquier cantidad de grupos de sprites
         """
-        super().__init__(*groups)
-        self.onGround = False  # ¿El jugador está en el suelo?
+        pygame.sprite.Sprite.__init__(self, *groups)
+        Body.__init__(self, pos)
         self.platforms = platforms  # Lista de obstáculos
-        self.died = False  # ¿El jugador ha muerto?
-        self.win = False  # ¿El jugador ha ganado el nivel?
 
-        self.image = pygame.transform.smoothscale(image, (32, 32))
+        # La imagen ya viene escalada desde el registro de imágenes; si no, se escala aquí
+        self.image = image if image.get_size() == (32, 32) else pygame.transform.smoothscale(image, (32, 32))
         self.rect = self.image.get_rect(center=pos)  # Rectángulo de la imagen del jugador
-        self.jump_amount = 12  # Fuerza del salto
-        self.particles = []  # Rastro de partículas detrás del jugador
-        self.isjump = False  # ¿El jugador está saltando?
-        self.vel = Vector2(0, 0)  # Velocidad inicial en cero
+        self.particles = ParticlePool()  # Rastro de partículas detrás del jugador
 
     def draw_particle_trail(self, x, y, color=(255, 255, 255)):
         """Dibuja un rastro de partículas detrás del jugador."""
-        
-        self.particles.append(
-            [[x - 5, y - 8], [random.randint(0, 25) / 10 - 1, 0], random.randint(5, 8)]
-        )
-
-        for particle in self.particles:
-            particle[0][0] += particle[1][0]
-            particle[0][1] += particle[1][1]
-            particle[2] -= 0.5
-            particle[1][0] -= 0.4
-            rect(alpha_surf, color, ([int(particle[0][0]), int(particle[0][1])], [int(particle[2])] * 2))
-            if particle[2] <= 0:
-                self.particles.remove(particle)
-
-
-    def collide(self, yvel, platforms):
-        """Gestiona las colisiones del jugador con las plataformas y otros objetos."""
-    
+        self.particles.emit(x - 5, y - 8, random.randint(0, 25) / 10 - 1, 0, random.randint(5, 8))
+        self.particles.step(alpha_surf, color)
+        trail.mark(self.particles.bounds())
+
+    def activate_orb(self, orb):
+        """Dibuja el destello del orbe y hace el salto en el aire"""
+        orb_center = camera.apply(orb.rect).center  # El orbe está en el mundo; se dibuja en pantalla
+        trail.mark(pygame.draw.circle(alpha_surf, (255, 255, 0), orb_center, 18))
+        dirty.stale(screen.blit(assets.image("editor-0.9s-47px.gif"), orb_center))
+        super().activate_orb(orb)
+
+    def collect(self, coin):
+        """Lleva el registro de todas las monedas obtenidas en el juego (máximo de 6)"""
         global coins
+        coins += 1
+        super().collect(coin)
 
-        for p in platforms:
-            if pygame.sprite.collide_rect(self, p):
-                # Método de colisión incorporado de pygame.sprite
-                # Comprueba si el jugador está colisionando con algún obstáculo
-                if isinstance(p, Orb) and (keys[pygame.K_UP] or keys[pygame.K_SPACE]):
-                    pygame.draw.circle(alpha_surf, (255, 255, 0), p.rect.center, 18)
-                    screen.blit(pygame.image.load("images/editor-0.9s-47px.gif"), p.rect.center)
-                    self.jump_amount = 12  # Aumenta la fuerza de salto al tocar un orbe
-                    self.jump()
-                    self.jump_amount = 10  # Restaura la fuerza de salto a su valor original
-
-                if isinstance(p, End):
-                    self.win = True  # Marca victoria al llegar al final del nivel
-
-                if isinstance(p, Spike):
-                    self.died = True  # Marca muerte al tocar un pico
-
-                if isinstance(p, Coin):
-                    # Lleva el registro de todas las monedas obtenidas en el juego (máximo de 6)
-                    coins += 1
-
-                    # Borra la moneda
-                    p.rect.x = 0
-                    p.rect.y = 0
-
-                if isinstance(p, Platform):  # Estas son las plataformas (puede ser confuso debido a self.platforms)
-
-                    if yvel > 0:
-                        # Si el jugador está cayendo (yvel es positivo)
-                        self.rect.bottom = p.rect.top  # Evita que el jugador atraviese el suelo
-                        self.vel.y = 0  # Restaura la velocidad en y porque el jugador está en el suelo
-
-                        # Establece self.onGround en True porque el jugador está en el suelo
-                        self.onGround = True
-
-                        # Reinicia el salto
-                        self.isjump = False
-                    elif yvel < 0:
-                        # Si yvel es negativo, el jugador colisionó mientras saltaba
-                        self.rect.top = p.rect.bottom  # La parte superior del jugador se establece en la parte inferior del bloque, como si golpeara su cabeza
-                    else:
-                        # De lo contrario, si el jugador choca con un bloque, muere
-                        self.vel.x = 0
-                        self.rect.right = p.rect.left  # Evita que el jugador atraviese paredes
-                        self.died = True
-
-    def jump(self):
-        """Hace que el jugador salte"""
-        self.vel.y = -self.jump_amount  # La velocidad vertical del jugador es negativa (salto hacia arriba)
-
-    def update(self):
-        """Actualiza el estado del jugador"""
-        if self.isjump:
-            if self.onGround:
-                # Si el jugador quiere saltar y está en el suelo, solo entonces se permite el salto
-                self.jump()
-
-        if not self.onGround:  # Acelera con la gravedad solo si está en el aire
-            self.vel += GRAVITY  # Aplica la gravedad
-
-            # Velocidad máxima de caída
-            if self.vel.y > 100: 
-                self.vel.y = 100
-
-        # Colisiones en el eje X
-        self.collide(0, self.platforms)
-
-        # Incremento en la dirección Y
-        self.rect.top += self.vel.y
-
-        # Se asume que el jugador está en el aire; si no, se ajustará en collide
-        self.onGround = False
-
-        # Colisiones en el eje Y
-        self.collide(self.vel.y, self.platforms)
+    def nearby(self):
+        """Obstáculos de las celdas que cubre el jugador, consultados en la cuadrícula del nivel.
+        El jugador y la cuadrícula están en coordenadas del mundo."""
+        return grid.query(self.rect)
+
+    def update(self, pressed=False):
+        """Actualiza el estado del jugador
+        :param pressed: ¿está presionado el salto?"""
+        super().update(pressed)
 
         # Verifica si el jugador ganó o murió
         eval_outcome(self.win, self.died)
@@ -181,6 +139,7 @@ Clases de Obstáculos
 # Clase principal
 class Draw(pygame.sprite.Sprite):
     """Clase padre para todos los obstáculos; hereda de Sprite"""
+    kind = None  # Tipo de casilla para la física (ver sim.py)
 
     def __init__(self, image, pos, *groups):
         super().__init__(*groups)
@@ -195,6 +154,7 @@ class Draw(pygame.sprite.Sprite):
 # Clase hija para plataformas
 class Platform(Draw):
     """Clase para representar los bloques"""
+    kind = PLATFORM
 
     def __init__(self, image, pos, *groups):
         super().__init__(image, pos, *groups)
@@ -206,6 +166,7 @@ class Platform(Draw):
 # Clases hijas de Draw
 class Platform(Draw):
     """bloque"""
+    kind = PLATFORM
 
     def __init__(self, image, pos, *groups):
         super().__init__(image, pos, *groups)
@@ -213,6 +174,7 @@ class Platform(Draw):
 
 class Spike(Draw):
     """pico"""
+    kind = SPIKE
 
     def __init__(self, image, pos, *groups):
         super().__init__(image, pos, *groups)
@@ -220,6 +182,7 @@ class Spike(Draw):
 
 class Coin(Draw):
     """moneda. Obtén 6 para ganar el juego"""
+    kind = COIN
 
     def __init__(self, image, pos, *groups):
         super().__init__(image, pos, *groups)
@@ -227,6 +190,7 @@ class Coin(Draw):
 
 class Orb(Draw):
     """orbe. Presiona espacio o flecha hacia arriba mientras estás sobre él para saltar en el aire"""
+    kind = ORB
 
     def __init__(self, image, pos, *groups):
         super().__init__(image, pos, *groups)
@@ -234,6 +198,7 @@ class Orb(Draw):
 
 class Trick(Draw):
     """bloque, pero es un truco porque puedes atravesarlo"""
+    kind = TRICK
 
     def __init__(self, image, pos, *groups):
         super().__init__(image, pos, *groups)
@@ -241,6 +206,7 @@ class Trick(Draw):
 
 class End(Draw):
     """coloca esto al final del nivel"""
+    kind = END
 
     def __init__(self, image, pos, *groups):
         super().__init__(image, pos, *groups)
@@ -251,76 +217,77 @@ Funciones
 """
 
 
-def init_level(map):
-    """Similar a listas 2D. Recorre una lista de listas y crea instancias de ciertos obstáculos 
-    dependiendo del elemento en la lista."""
-    x = 0
-    y = 0
-
-    for row in map:
-        for col in row:
-
-            if col == "0":
-                Platform(block, (x, y), elements)
-
-            if col == "Coin":
-                Coin(coin, (x, y), elements)
-
-            if col == "Spike":
-                Spike(spike, (x, y), elements)
-
-            if col == "Orb":
-                orbs.append([x, y])
-                Orb(orb, (x, y), elements)
-
-            if col == "T":
-                Trick(trick, (x, y), elements)
+def init_level(map, bake=False, stream=False):
+    """Recorre el arreglo de tipos de casilla del nivel (ver levels.py) fila por fila y crea instancias
+    de ciertos obstáculos dependiendo del tipo. También construye la cuadrícula de colisiones del nivel.
+    :param map: arreglo (filas, columnas) de tipos de casilla, como lo devuelve load_level
+    :param bake: si es True, los obstáculos estáticos se dibujan en trozos precalculados (ver chunks.py)
+    y solo las monedas y los orbes se dibujan uno por uno
+    :param stream: si es True, solo se crean los obstáculos de las columnas cercanas a la cámara (ver streaming.py)
+    y no se usan trozos precalculados"""
+    global grid, drawables, chunks, level_stream
+    sprite_types = {PLATFORM: (Platform, block), COIN: (Coin, coin), SPIKE: (Spike, spike), ORB: (Orb, orb),
+                    TRICK: (Trick, trick), END: (End, avatar)}
+
+    def spawn(kind, pos):
+        kind_class, image = sprite_types[kind]
+        return kind_class(image, pos, elements)
+
+    level_stream = None
+    if stream:
+        grid = drawables = TileGrid(32)
+        chunks = None
+        level_stream = LevelStream(map, spawn, grid)
+        level_stream.update(camera.view)
+        return
+
+    rows, cols = map.nonzero()  # Casillas no vacías, fila por fila
+    for row, col, kind in zip(rows.tolist(), cols.tolist(), map[rows, cols].tolist()):
+        x, y = col * 32, row * 32
+        if kind == ORB:
+            orbs.append([x, y])
+        spawn(kind, (x, y))
+
+    # Indexa los obstáculos por celda (en el orden del grupo) para que collide solo revise los cercanos
+    grid = TileGrid(32)
+    for sprite in elements:
+        grid.insert(sprite, pygame.Rect(sprite.rect))
 
-            if col == "End":
-                End(avatar, (x, y), elements)
-            x += 32
-        y += 32
-        x = 0
+    # Obstáculos que se dibujan uno por uno: todos, o solo los dinámicos si los estáticos van en trozos
+    drawables = grid
+    chunks = None
+    if bake:
+        static = [sprite for sprite in elements if isinstance(sprite, (Platform, Trick, Spike, End))]
+        chunks = ChunkCache(static, budget=CHUNK_BUDGET)
+        drawables = TileGrid(32)
+        for sprite in elements:
+            if isinstance(sprite, (Coin, Orb)):
+                drawables.insert(sprite, pygame.Rect(sprite.rect))
 
 
 def blitRotate(surf, image, pos, originpos: tuple, angle: float):
     """
-    Rota la imagen del jugador
+    Rota la imagen del jugador. Las rotaciones se guardan por ángulo redondeado a ROTATION_STEP grados
+    (ver rotation.py), así que solo se calcula cada ángulo la primera vez.
     :param surf: Superficie en la que se dibuja
     :param image: imagen a rotar
     :param pos: posición de la imagen
     :param originpos: posición x, y del origen alrededor del cual rotar
     :param angle: ángulo de rotación
+    :return: rectángulo en el que se dibujó
     """
-    # Calcula el cuadro delimitador alineado al eje de la imagen rotada
-    w, h = image.get_size()
-    box = [Vector2(p) for p in [(0, 0), (w, 0), (w, -h), (0, -h)]]
-    box_rotate = [p.rotate(angle) for p in box]
-
-    # Asegura que el jugador no se sobreponga; usa algunas funciones lambda (nuevas cosas que no aprendimos en número 1)
-    min_box = (min(box_rotate, key=lambda p: p[0])[0], min(box_rotate, key=lambda p: p[1])[1])
-    max_box = (max(box_rotate, key=lambda p: p[0])[0], max(box_rotate, key=lambda p: p[1])[1])
-
-    # Calcula la traslación del pivote
-    pivot = Vector2(originpos[0], -originpos[1])
-    pivot_rotate = pivot.rotate(angle)
-    pivot_move = pivot_rotate - pivot
-
-    # Calcula el origen en la esquina superior izquierda de la imagen rotada
-    origin = (pos[0] - originpos[0] + min_box[0] - pivot_move[0], pos[1] - originpos[1] - max_box[1] + pivot_move[1])
-
-    # Obtén una imagen rotada
-    rotated_image = pygame.transform.rotozoom(image, angle, 1)
-
-    # Rota y dibuja la imagen
-    surf.blit(rotated_image, origin)
+    key = (image, tuple(originpos))
+    cache = rotations.get(key)
+    if cache is None:
+        cache = rotations[key] = RotationCache(image, originpos, ROTATION_STEP)
+    return cache.blit(surf, pos, angle)
 
 def won_screen():
     """Muestra esta pantalla cuando se completa un nivel"""
     global attempts, level, fill
     attempts = 0
     player_sprite.clear(player.image, screen)
-    screen.fill(pygame.Color("yellow"))
+    screen.fill(texts.color("yellow"))
     txt_win1 = txt_win2 = "Nada"
     if level == 1:
         if coins == 6:
@@ -331,13 +298,13 @@ def won_screen():
         txt_win2 = f"Monedas: {coins}/6. "
     txt_win = f"{txt_win1} Completaste {txt_win2}! Presiona ESPACIO para reiniciar, o ESC para salir"
 
-    won_game = font.render(txt_win, True, BLUE)
+    won_game = texts.render(font, txt_win, True, BLUE)
 
     screen.blit(won_game, (200, 300))
     level += 1
 
-    wait_for_key()
-    reset()
+    if wait_for_key():
+        reset()
 
 
 def death_screen():
@@ -346,13 +313,13 @@ def death_screen():
     fill = 0
     player_sprite.clear(player.image, screen)
     attempts += 1
-    game_over = font.render("Game Over. [ESPACIO] para reiniciar", True, WHITE)
+    game_over = texts.render(font, "Game Over. [ESPACIO] para reiniciar", True, WHITE)
 
-    screen.fill(pygame.Color("sienna1"))
+    screen.fill(texts.color("sienna1"))
     screen.blits([[game_over, (100, 100)], [tip, (100, 400)]])
 
-    wait_for_key()
-    reset()
+    if wait_for_key():
+        reset()
 
 
 def eval_outcome(won: bool, died: bool):
@@ -363,56 +330,120 @@ def eval_outcome(won: bool, died: bool):
         death_screen()
 
 
-def block_map(level_num):
-    """
-    :type level_num: rect(screen, BLACK, (0, 0, 32, 32))
-    Abre un archivo CSV que contiene el mapa correcto del nivel
-    """
-    lvl = []
-    with open(level_num, newline='') as csvfile:
-        trash = csv.reader(csvfile, delimiter=',', quotechar='"')
-        for row in trash:
-            lvl.append(row)
-    return lvl
-
-
 def start_screen():
     """Pantalla de inicio. Opción para cambiar de nivel, guía de controles y visión general del juego."""
-    global level
     if not start:
         screen.fill(BLACK)
-        if pygame.key.get_pressed()[pygame.K_1]:
-            level = 0
-        if pygame.key.get_pressed()[pygame.K_2]:
-            level = 1
-
-        welcome = font.render(f"Bienvenido a Pydash.", True, WHITE)
-        welcome1 = font.render(f"Elige nivel ({level + 1})  con el teclado numérico", True, WHITE)
-        controls = font.render("Controles: salto: Espacio/Arriba, salir: Esc", True, GREEN)
+        welcome = texts.render(font, f"Bienvenido a Pydash.", True, WHITE)
+        welcome1 = texts.render(font, f"Elige nivel ({level + 1})  con el teclado numérico", True, WHITE)
+        controls = texts.render(font, "Controles: salto: Espacio/Arriba, salir: Esc", True, GREEN)
 
         screen.blits([[welcome, (50, 100)],[welcome1, (50, 150)] ,[controls, (50, 400)], [tip, (50, 500)]])
 
-        level_memo = font.render(f"Nivel {level + 1}.", True, (255, 255, 0))
+        name = "Sin fin" if levels[level] == ENDLESS else f"Nivel {level + 1}"
+        level_memo = texts.render(font, f"{name}.", True, (255, 255, 0))
         screen.blit(level_memo, (50, 200))
 
 
 def reset():
-    """Restablece los grupos de sprites, música, etc. para reiniciar en caso de muerte o nuevo nivel"""
-    global player, elements, player_sprite, level
+    """Restablece el jugador, las monedas, la música, etc. para reiniciar en caso de muerte o nuevo nivel.
+    Si el nivel no cambió, el estado inicial guardado en level_state se restaura en el lugar, sin crear sprites;
+    solo un nivel nuevo reconstruye los grupos de sprites"""
+    global player, elements, player_sprite, level, level_state, loaded_level, replay_tick
+
+    if recorder is not None:
+        recorder.finish(attempt_result(player.vel.x))
+        recorder.start(levels[level] if levels[level] != ENDLESS else None)  # El nivel sin fin no se graba
+    replay_tick = 0
+    timestep.reset()  # El tiempo en la pantalla de espera no se simula
+    if music.result():  # Espera a que el audio termine de abrirse (casi siempre ya terminó)
+        if level == 1:
+            pygame.mixer.music.load(os.path.join("music", "castle-town.mp3"))
+        pygame.mixer_music.play()
+    camera.reset()
+    dirty.invalidate()  # La pantalla de muerte o de victoria cubrió todo
+    if level == loaded_level:
+        level_state.restore()
+        player.particles.clear()
+        if level_stream is not None:
+            level_stream.reset()  # Las monedas vuelven porque las columnas se crean de nuevo
+            level_stream.update(camera.view)
+        remember()  # Si no, el primer fotograma se dibujaría entre el lugar de la muerte y el inicio
+        return
 
-    if level == 1:
-        pygame.mixer.music.load(os.path.join("music", "castle-town.mp3"))
-    pygame.mixer_music.play()
     player_sprite = pygame.sprite.Group()
     elements = pygame.sprite.Group()
-    player = Player(avatar, elements, (150, 150), player_sprite)
-    init_level(block_map(level_num=levels[level]))
+    player = Player(player_image, elements, (150, 150), player_sprite)
+    level_map = open_level(levels[level])
+    init_level(level_map, BAKE_LEVEL and not DIRTY_RECTS, level_map.shape[1] > STREAM_COLUMNS)
+    level_state = LevelSnapshot(player, () if level_stream is not None else elements)
+    loaded_level = level
+    remember()
+
+
+def open_level(name):
+    """Arreglo de tipos de casilla de un nivel, o el nivel sin fin (que empieza a generarse en otro proceso)"""
+    global endless
+    if name != ENDLESS:
+        return load_level(name)
+    if endless is None:
+        endless = EndlessLevel(ChunkWorker(ENDLESS_SEED, ENDLESS_AHEAD).start(), ENDLESS_WAIT if ENDLESS_SEED else 0)
+    return endless
+
+
+def attempt_result(advance=0):
+    """Resultado del intento actual, para las repeticiones (como sim.Simulation.result)
+    :param advance: píxeles que el jugador todavía no avanzó en este paso (al ganar o morir dentro de Player.update)"""
+    return {"won": player.win, "died": player.died, "ticks": len(recorder.inputs), "coins": player.coins,
+            "column": (player.rect.left + int(advance)) // 32}
+
+
+def move_camera():
+    """Avanza al jugador y a la cámara. Los obstáculos se quedan quietos en coordenadas del mundo,
+    así que avanzar no cuesta nada por cada obstáculo del nivel."""
+    player.rect.x += CameraX
+    camera.scroll(CameraX)
+    if level_stream is not None:
+        level_stream.update(camera.view)  # Carga las columnas que se acercan y descarta las que quedaron atrás
+
+
+def step(pressed):
+    """Un paso fijo de física (ver timestep.py): jugador, cámara, barra de progreso y giro del salto.
+    :param pressed: ¿está presionado el salto en el teclado? (una repetición lo reemplaza)"""
+    global CameraX, angle, fill, replay_tick
+    remember()
+    if replay is not None:
+        pressed = replay_tick < len(replay.inputs) and replay.inputs[replay_tick]
+        replay_tick += 1
+    if recorder is not None:
+        recorder.record(pressed)
+
+    player_sprite.update(pressed)
+    CameraX = player.vel.x  # para mover al jugador y a la cámara
+    move_camera()  # aplica CameraX al jugador y a la cámara
+    fill += 0.5  # La barra de progreso avanza con los pasos, no con los fotogramas
+    if player.isjump:
+        angle -= 8.1712  # este puede ser el ángulo necesario para hacer un giro de 360 grados en el espacio cubierto en un salto por el jugador
+    player.vel.x = SPEED  # reset deja vel.x en 0, así que el primer paso de un intento no avanza
 
 
-def move_map():
-    """Mueve los obstáculos a lo largo de la pantalla"""
-    for sprite in elements:
-        sprite.rect.x -= CameraX
+def remember():
+    """Guarda la cámara, el jugador en pantalla y el ángulo actuales como los del paso anterior (ver interpolated)"""
+    global previous
+    previous = ((camera.x, camera.y), camera.apply(player.rect).topleft, angle)
+
+
+def interpolated(alpha):
+    """
+    Lo que se dibuja entre el paso anterior y el actual (ver timestep.py)
+    :param alpha: 0 es el paso anterior, 1 el actual
+    :return: (cámara, rectángulo del jugador en pantalla, ángulo del jugador)
+    """
+    camera_pos, (x, y), turn = previous
+    player_screen = camera.apply(player.rect)
+    player_screen.topleft = (round(interpolate(x, player_screen.x, alpha)),
+                             round(interpolate(y, player_screen.y, alpha)))
+    return camera.between(camera_pos, alpha), player_screen, interpolate(turn, angle, alpha)
 
 
 def draw_stats(surf, money=0):
@@ -420,43 +451,49 @@ def draw_stats(surf, money=0):
     Dibuja la barra de progreso del nivel, el número de intentos, muestra las monedas recolectadas 
     y cambia progresivamente el color de la barra de progreso.
     """
-    global fill
-    progress_colors = [pygame.Color("red"), pygame.Color("orange"), pygame.Color("yellow"), pygame.Color("lightgreen"),
-                       pygame.Color("green")]
-
-    tries = font.render(f"Intento {str(attempts)}", True, WHITE)
+    tries = texts.render(font, f"Intento {str(attempts)}", True, WHITE)  # Solo se dibuja de nuevo si cambia
     BAR_LENGTH = 600
     BAR_HEIGHT = 10
     for i in range(1, money):
-        screen.blit(coin, (BAR_LENGTH, 25))
-    fill += 0.5
+        dirty.add(screen.blit(coin, (BAR_LENGTH, 25)))
     outline_rect = pygame.Rect(0, 0, BAR_LENGTH, BAR_HEIGHT)
-    fill_rect = pygame.Rect(0, 0, fill, BAR_HEIGHT)
-    col = progress_colors[int(fill / 100)]
-    rect(surf, col, fill_rect, 0, 4)
-    rect(surf, WHITE, outline_rect, 3, 4)
-    screen.blit(tries, (BAR_LENGTH, 0))
+    fill_rect = pygame.Rect(0, 0, min(fill, BAR_LENGTH), BAR_HEIGHT)  # Sin fin: queda llena
+    col = progress_colors[min(int(fill / 100), len(progress_colors) - 1)]
+    dirty.add(rect(surf, col, fill_rect, 0, 4))
+    dirty.add(rect(surf, WHITE, outline_rect, 3, 4))
+    dirty.add(screen.blit(tries, (BAR_LENGTH, 0)))
 
 def wait_for_key():
-    """Bucle separado del juego para esperar la pulsación de una tecla mientras sigue corriendo el bucle principal del juego"""
-    global level, start
-    waiting = True
-    while waiting:
-        clock.tick(60)
-        pygame.display.flip()
-
-        if not start:
-            start_screen()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    start = True
-                    waiting = False
-                if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
+    """Espera la pulsación de una tecla en el menú o en las pantallas de muerte y victoria.
+    La pantalla se dibuja una vez y después el programa duerme en pygame.event.wait hasta que llega un evento;
+    solo se vuelve a dibujar si algo cambia (el nivel elegido, o la ventana que vuelve a mostrarse).
+    :return: True si se presionó ESPACIO, False si se cerró la ventana o se presionó ESC (done queda en True)
+    """
+    global level, start, done
+    if not start:
+        start_screen()
+    pygame.display.flip()
+    startup.first_frame()  # La primera vez, termina el informe de arranque
+    while True:
+        event = pygame.event.wait(IDLE_TIMEOUT)  # NOEVENT si pasa el tiempo sin eventos
+        redraw = event.type == pygame.WINDOWEXPOSED
+        if event.type == pygame.QUIT:
+            done = True
+            return False
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                start = True
+                return True
+            if event.key == pygame.K_ESCAPE:
+                done = True
+                return False
+            if not start and event.key in (pygame.K_1, pygame.K_2, pygame.K_3):
+                """Cambia el nivel con el teclado"""
+                level = event.key - pygame.K_1
+                start_screen()
+                redraw = True
+        if redraw:
+            pygame.display.flip()
 
 
 def coin_count(coins):
@@ -481,33 +518,43 @@ def resize(img, size=(32, 32)):
     return resized
 
 
+def start_music():
+    """Abre el dispositivo de audio y empieza la música del primer nivel (corre en otro hilo, ver load)
+    :return: False si no hay audio; el juego sigue sin música"""
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        return False
+    pygame.mixer_music.load(os.path.join("music", "bossfight-Vextron.mp3"))
+    pygame.mixer_music.play()
+    return True
+
+
 """
 Variables globales
 """
-font = pygame.font.SysFont("lucidaconsole", 20)
+# Las que necesitan la ventana, el disco o el audio se crean en load(): importar este módulo no abre nada
+
+# Textos y colores con nombre ya creados (texts.stats() da las cuentas)
+texts = TextCache()
+progress_colors = [texts.color(name) for name in ("red", "orange", "yellow", "lightgreen", "green")]
 
-# El bloque cuadrado con cara es el personaje principal, y es el ícono de la ventana del juego
-avatar = pygame.image.load(os.path.join("images", "avatar.png"))  # Carga el personaje principal
-pygame.display.set_icon(avatar)
+# Dibuja solo los obstáculos visibles; renderer.stats() cuenta los del último fotograma (sprites y trozos aparte)
+renderer = CulledRenderer()
 
-# Esta superficie tiene un valor alfa con los colores, así que el rastro del jugador se desvanecerá usando opacidad
-alpha_surf = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+# Tiempos por fase de cada fotograma (ver profiler.py); desactivado no cuesta nada
+profiler = FrameProfiler(PROFILE)
+
+# Tiempo de cada fase del arranque hasta el primer fotograma (se imprime al salir con PYDASH_PROFILE)
+startup = StartupTimer(STARTED)
 
 # Grupos de sprites
 player_sprite = pygame.sprite.Group()
 elements = pygame.sprite.Group()
-
-# Imágenes
-spike = pygame.image.load(os.path.join("images", "obj-spike.png"))
-spike = resize(spike)
-coin = pygame.image.load(os.path.join("images", "coin.png"))
-coin = pygame.transform.smoothscale(coin, (32, 32))
-block = pygame.image.load(os.path.join("images", "block_1.png"))
-block = pygame.transform.smoothscale(block, (32, 32))
-orb = pygame.image.load((os.path.join("images", "orb-yellow.png")))
-orb = pygame.transform.smoothscale(orb, (32, 32))
-trick = pygame.image.load((os.path.join("images", "obj-breakable.png")))
-trick = pygame.transform.smoothscale(trick, (32, 32))
+grid = TileGrid(32)  # Índice espacial de elements, se reconstruye en init_level
+drawables = grid  # Obstáculos que se dibujan uno por uno
+chunks = None  # Trozos precalculados de los obstáculos estáticos (si BAKE_LEVEL)
+level_stream = None  # Columnas cargadas del nivel (si es más ancho que STREAM_COLUMNS)
 
 # Enteros
 fill = 0
@@ -518,92 +565,211 @@ coins = 0
 angle = 0
 level = 0
 
+# Rotaciones guardadas por (imagen, pivote), ver blitRotate
+rotations = {}
+
 # Listas
 particles = []
 orbs = []
 win_cubes = []
 
 # Inicializa el nivel con
-levels = ["level_1.csv", "level_2.csv"]
-level_list = block_map(levels[level])
-level_width = (len(level_list[0]) * 32)
-level_height = len(level_list) * 32
-init_level(level_list)
-
-# Establece el título de la ventana adecuado para el juego
-pygame.display.set_caption('Pydash: Geometry Dash en Python')
-
-# Inicializa la variable de la fuente para dibujar texto más tarde
-text = font.render('imagen', False, (255, 255, 0))
-
-# Música
-music = pygame.mixer_music.load(os.path.join("music", "bossfight-Vextron.mp3"))
-pygame.mixer_music.play()
-
-# Imagen de fondo
-bg = pygame.image.load(os.path.join("images", "bg.png"))
-
-# Crea el objeto de la clase Player
-player = Player(avatar, elements, (150, 150), player_sprite)
-# mostrar consejo al inicio y al morir
-tip = font.render("consejo:toca y mantén presionado durante los primeros segundos del nivel", True, BLUE)
-
-while not done:
-    keys = pygame.key.get_pressed()
-
-    if not start:
-        wait_for_key()
-        reset()
-
-        start = True
-
-    player.vel.x = 6
+levels = ["level_1.csv", "level_2.csv", ENDLESS]
+endless = None  # Nivel sin fin, creado la primera vez que se juega
+replay_tick = 0  # Paso de la repetición en el intento actual
+
+
+def load():
+    """Inicializa los módulos de pygame que usa el juego (ventana y fuentes; el audio en otro hilo), abre la ventana
+    y carga las imágenes, el nivel y el jugador. La fuente del sistema y la música se cargan en otros hilos mientras
+    tanto, y la fuente se espera recién al final (ver startup.py)"""
+    global screen, clock, font, music, assets, avatar, player_image, trail, alpha_surf, camera, dirty, spike, coin, \
+        block, orb, trick, recorder, replay, game_speed, timestep, frame_rate, level, bg, player, \
+        level_state, loaded_level, tip
+
+    startup.mark("importar")  # Desde STARTED: pygame y los módulos del juego
+
+    # Solo la ventana y las fuentes; joystick, cdrom y los demás módulos de pygame.init() no se usan
+    pygame.display.init()
+    pygame.font.init()
+    font = startup.background("fuente", pygame.font.SysFont, "lucidaconsole", 20)  # Lee las fuentes del sistema
+    music = startup.background("música", start_music)
+    startup.mark("pygame")
+
+    # Crea una pantalla de tamaño 800 x 600 píxeles
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+
+    # Establece la tasa de fotogramas del programa
+    clock = pygame.time.Clock()
+    startup.mark("ventana")
+
+    # Registro de imágenes: cada imagen se lee, escala y convierte una sola vez (assets.stats() da las cuentas)
+    assets = Assets("images")
+
+    # El bloque cuadrado con cara es el personaje principal, y es el ícono de la ventana del juego
+    avatar = assets.image("avatar.png")  # Carga el personaje principal
+    player_image = assets.image("avatar.png", (32, 32))
+    pygame.display.set_icon(assets.load("avatar.png"))
+
+    # Esta superficie tiene un valor alfa con los colores, así que el rastro del jugador se desvanecerá
+    # usando opacidad
+    trail = TrailLayer(screen.get_size(), BOUNDED_TRAIL)
+    alpha_surf = trail.surf
+
+    # Cámara: desplazamiento de la vista sobre el nivel, que se aplica solo al dibujar
+    camera = Camera(screen.get_size())
+
+    # Rectángulos de pantalla dibujados en cada fotograma; desactivado, cada fotograma se borra y se envía completo
+    dirty = DirtyRects(screen.get_size(), DIRTY_RECTS)
+
+    # Imágenes
+    spike = assets.image("obj-spike.png", (32, 32))
+    coin = assets.image("coin.png", (32, 32))
+    block = assets.image("block_1.png", (32, 32))
+    orb = assets.image("orb-yellow.png", (32, 32))
+    trick = assets.image("obj-breakable.png", (32, 32))
+    assets.image("editor-0.9s-47px.gif")  # Destello de los orbes; se carga antes para no leer el disco al jugar
+
+    # Imagen de fondo
+    bg = assets.image("bg.png")
+    startup.mark("imágenes")
+
+    # Grabación de intentos y repetición en pantalla (ver replay.py)
+    recorder = Recorder(RECORD_FOLDER) if RECORD_FOLDER else None
+    replay = Replay.load(REPLAY) if REPLAY else None
+
+    # Pasos de física a ritmo fijo, sin importar los FPS; una repetición puede ir más rápido o más lento
+    game_speed = REPLAY_SPEED if replay is not None else 1
+    timestep = FixedTimestep(TICK_RATE * game_speed, MAX_FRAME_STEPS * max(1, math.ceil(game_speed)))
+    frame_rate = FRAME_RATE if game_speed else 0
+
+    if replay is not None:
+        if replay.level not in levels:
+            levels.append(replay.level)
+        level = levels.index(replay.level)
+    level_map = open_level(levels[level])
+    init_level(level_map, BAKE_LEVEL and not DIRTY_RECTS, level_map.shape[1] > STREAM_COLUMNS)
+
+    # Establece el título de la ventana adecuado para el juego
+    pygame.display.set_caption('Pydash: Geometry Dash en Python')
+
+    # Crea el objeto de la clase Player
+    player = Player(player_image, elements, (150, 150), player_sprite)
+
+    # Estado inicial del nivel cargado, para reiniciar sin reconstruirlo (ver reset)
+    level_state = LevelSnapshot(player, () if level_stream is not None else elements)
+    loaded_level = level
+    remember()  # Paso anterior, ver interpolated
+    startup.mark("nivel")
+
+    # La fuente es lo primero que se dibuja: aquí sí hay que esperarla
+    font = font.result()
+
+    # mostrar consejo al inicio y al morir
+    tip = font.render("consejo:toca y mantén presionado durante los primeros segundos del nivel", True, BLUE)
+    startup.mark("fuente")
+
+    # Todas las imágenes ya están cargadas: desde aquí, leer una del disco es un error (el juego no lee archivos)
+    assets.lock()
+
+
+def main():
+    """Carga el juego y corre el bucle principal hasta que se cierra la ventana"""
+    global start, done
+    load()
 
-    eval_outcome(player.win, player.died)
-    if keys[pygame.K_UP] or keys[pygame.K_SPACE]:
-        player.isjump = True
+    while not done:
+        profiler.begin()
+        keys = pygame.key.get_pressed()
 
-    # Reduce el alfa de todos los píxeles en esta superficie en cada fotograma.
-    # Controla la velocidad del desvanecimiento con el valor alfa.
-
-    alpha_surf.fill((255, 255, 255, 1), special_flags=pygame.BLEND_RGBA_MULT)
-
-    player_sprite.update()
-    CameraX = player.vel.x  # para mover los obstáculos
-    move_map()  # aplica CameraX a todos los elementos
-
-    screen.blit(bg, (0, 0))  # Borra la pantalla (con el fondo)
-
-    player.draw_particle_trail(player.rect.left - 1, player.rect.bottom + 2,
-                               WHITE)
-    screen.blit(alpha_surf, (0, 0))  # Dibuja alpha_surf en la pantalla.
-    draw_stats(screen, coin_count(coins))
-
-    if player.isjump:
-        """Rota al jugador por un ángulo y dibuja si el jugador está saltando"""
-        angle -= 8.1712  # este puede ser el ángulo necesario para hacer un giro de 360 grados en el espacio cubierto en un salto por el jugador
-        blitRotate(screen, player.image, player.rect.center, (16, 16), angle)
-    else:
-        """Si player.isjump es falso, simplemente dibuja normalmente (usando Group().draw() para los sprites)"""
-        player_sprite.draw(screen)  # dibuja el grupo de sprites del jugador
-    elements.draw(screen)  # dibuja todos los demás obstáculos
+        if not start:
+            if not wait_for_key():
+                break
+            reset()
+
+            start = True
+
+        player.vel.x = SPEED
+
+        eval_outcome(player.win, player.died)
+        jumping = keys[pygame.K_UP] or keys[pygame.K_SPACE]  # El salto se aplica en Player.update
+        profiler.lap("input")
+
+        # Reduce el alfa de los píxeles de alpha_surf dibujados en el fotograma anterior.
+        # Controla la velocidad del desvanecimiento con el valor alfa (trail.FADE).
+        trail.fade()
+        profiler.lap("fade")
+
+        # Tantos pasos de física como el tiempo que pasó desde el fotograma anterior (ver timestep.py)
+        timestep.advance()
+        while not done and timestep.due():  # Al salir desde la pantalla de muerte no quedan pasos por dar
+            step(jumping)
+        profiler.lap("update")
+        view, player_screen, turn = interpolated(timestep.alpha)
+
+        dirty.erase(screen, bg)  # Borra la pantalla (con el fondo), o solo lo que se dibujó en el fotograma anterior
+        profiler.lap("background")
+
+        player.draw_particle_trail(player_screen.left - 1, player_screen.bottom + 2,
+                                   WHITE)
+        dirty.extend(trail.composite(screen))  # Dibuja alpha_surf en la pantalla (solo las partes con rastro)
+        profiler.lap("trail")
+        draw_stats(screen, coin_count(coins))
+        profiler.lap("stats")
+
+        if player.isjump:
+            """Rota al jugador por un ángulo y dibuja si el jugador está saltando"""
+            dirty.add(blitRotate(screen, player.image, player_screen.center, (16, 16), turn))
+        else:
+            """Si player.isjump es falso, simplemente dibuja normalmente"""
+            dirty.add(screen.blit(player.image, player_screen))  # dibuja al jugador
+        profiler.lap("player")
+        renderer.draw(screen, view, drawables, chunks, dirty)  # dibuja los demás obstáculos que se ven en pantalla
+        profiler.lap("obstacles")
+        for name, value in renderer.stats().items():
+            profiler.count(name, value)  # Obstáculos dibujados y descartados, en el resumen del perfilador
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            done = True
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                """Salida amigable para el usuario"""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
                 done = True
-            if event.key == pygame.K_2:
-                """Cambia el nivel con el teclado"""
-                player.jump_amount += 1
-
-            if event.key == pygame.K_1:
-                """Cambia el nivel con el teclado"""
-
-                player.jump_amount -= 1
-
-    pygame.display.flip()
-    clock.tick(60)
-pygame.quit()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    """Salida amigable para el usuario"""
+                    done = True
+                if event.key == pygame.K_2:
+                    """Cambia el nivel con el teclado"""
+                    player.jump_amount += 1
+
+                if event.key == pygame.K_1:
+                    """Cambia el nivel con el teclado"""
+
+                    player.jump_amount -= 1
+                if event.key == pygame.K_F3:
+                    """Muestra u oculta el resumen del perfilador"""
+                    profiler.overlay = profiler.enabled and not profiler.overlay
+        profiler.lap("events")
+        dirty.extend(profiler.draw(screen, font))
+
+        dirty.present()  # display.flip, o display.update solo con lo que cambió
+        profiler.lap("flip")
+        clock.tick(frame_rate)
+        profiler.lap("wait")
+        profiler.end()
+
+    if recorder is not None:
+        recorder.finish(attempt_result())
+    if endless is not None:
+        endless.worker.stop()
+    music.result()  # pygame.quit no debe cerrar el audio mientras el otro hilo lo abre
+    if profiler.enabled:
+        print(startup.report())
+        print(profiler.report())
+        if endless is not None:
+            print(endless.report())
+        if PROFILE_DUMP.endswith((".csv", ".json")):
+            profiler.dump(PROFILE_DUMP)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
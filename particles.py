@@ -0,0 +1,97 @@
+"""
+Sistema de partículas de capacidad fija.
+
+Las partículas viven en arreglos de NumPy reservados una sola vez (posición, velocidad y tamaño). Se actualizan todas
+a la vez, las que se apagan se compactan sin recorrer la lista, y se dibujan en una sola llamada a blits con
+cuadrados ya preparados para cada tamaño.
+"""
+import numpy as np
+import pygame
+
+
+class ParticlePool:
+    """Partículas cuadradas que se mueven, frenan y se encogen hasta desaparecer"""
+
+    def __init__(self, capacity=256, shrink=0.5, drag=0.4):
+        """
+        :param capacity: máximo de partículas vivas
+        :param shrink: cuánto se encoge cada partícula por fotograma
+        :param drag: cuánto se reduce la velocidad horizontal por fotograma
+        """
+        self.capacity = capacity
+        self.shrink = shrink
+        self.drag = drag
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.size = np.zeros(capacity)
+        self.count = 0  # Partículas vivas, siempre en las primeras posiciones de los arreglos
+        self.squares = {}  # (color, tamaño) -> superficie del cuadrado
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, x, y, vx, vy, size):
+        """Agrega una partícula; si no hay lugar, reemplaza a la que está por apagarse"""
+        if self.count < self.capacity:
+            i = self.count
+            self.count += 1
+        else:
+            i = int(np.argmin(self.size))
+        self.pos[i] = x, y
+        self.vel[i] = vx, vy
+        self.size[i] = size
+
+    def update(self):
+        """Mueve, frena y encoge todas las partículas a la vez"""
+        n = self.count
+        self.pos[:n] += self.vel[:n]
+        self.size[:n] -= self.shrink
+        self.vel[:n, 0] -= self.drag
+
+    def square(self, color, size):
+        """Cuadrado relleno del color y tamaño dados, creado una sola vez"""
+        key = (color, size)
+        surf = self.squares.get(key)
+        if surf is None:
+            surf = pygame.Surface((size, size), pygame.SRCALPHA)
+            surf.fill(color)
+            self.squares[key] = surf
+        return surf
+
+    def draw(self, surf, color=(255, 255, 255)):
+        """Dibuja todas las partículas vivas en una sola llamada"""
+        n = self.count
+        xy = self.pos[:n].astype(int).tolist()
+        sizes = self.size[:n].astype(int).tolist()
+        color = tuple(color)
+        surf.blits([(self.square(color, s), p) for p, s in zip(xy, sizes) if s > 0], False)
+
+    def bounds(self):
+        """Rectángulo que cubre las partículas vivas (None si no hay ninguna)"""
+        n = self.count
+        if not n:
+            return None
+        left, top = self.pos[:n].astype(int).min(axis=0).tolist()
+        right, bottom = (self.pos[:n].astype(int) + self.size[:n, None].astype(int)).max(axis=0).tolist()
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def compact(self):
+        """Quita las partículas apagadas moviendo las vivas al principio de los arreglos"""
+        n = self.count
+        alive = self.size[:n] > 0
+        k = int(np.count_nonzero(alive))
+        if k < n:
+            self.pos[:k] = self.pos[:n][alive]
+            self.vel[:k] = self.vel[:n][alive]
+            self.size[:k] = self.size[:n][alive]
+            self.count = k
+
+    def step(self, surf, color=(255, 255, 255)):
+        """Un fotograma completo: actualiza, dibuja y quita las apagadas"""
+        self.update()
+        self.draw(surf, color)
+        self.compact()
+
+    def clear(self):
+        """Apaga todas las partículas"""
+        self.count = 0
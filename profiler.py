@@ -0,0 +1,177 @@
+"""
+Perfilador de fotogramas por fases.
+
+El bucle del juego marca el final de cada fase (entrada, física, dibujo, flip...) con lap, y aquí se guarda cuánto
+tardó cada una; con count, cuentas por fotograma (obstáculos dibujados y descartados). Con las últimas mediciones se
+calculan los percentiles p50/p95/p99 por fase y por cuenta, que se pueden ver encima del juego y guardar en CSV o
+JSON al salir.
+
+Desactivado, begin, lap, count y end son una función vacía: el costo es una llamada por fase y nada más.
+
+    profiler = FrameProfiler(enabled=True)
+    profiler.begin()
+    ...
+    profiler.lap("update")
+    ...
+    profiler.lap("draw")
+    profiler.count("drawn", sprites)
+    profiler.end()
+"""
+import csv
+import json
+import math
+from collections import deque
+from time import perf_counter
+
+PERCENTILES = (50, 95, 99)
+
+
+def _noop(*args):
+    pass
+
+
+def percentile(values, p):
+    """Percentil p (0-100) por rango más cercano de una lista ya ordenada"""
+    if not values:
+        return 0.0
+    rank = math.ceil(p / 100 * len(values))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+class FrameProfiler:
+    """Tiempos por fase de cada fotograma, con resumen de percentiles sobre una ventana móvil"""
+
+    def __init__(self, enabled=False, window=600, history=36000):
+        """
+        :param enabled: si es False, medir no cuesta nada (ver enable)
+        :param window: fotogramas que se usan para los percentiles (600 = 10 segundos a 60 FPS)
+        :param history: fotogramas que se guardan para dump
+        """
+        self.window = window
+        self.phases = []  # Nombres de las fases, en el orden en que aparecieron
+        self.recent = {}  # fase -> deque con los últimos tiempos (segundos)
+        self.frames = deque(maxlen=history)  # Un diccionario fase -> segundos por fotograma
+        self.counters = []  # Nombres de las cuentas (ver count), en el orden en que aparecieron
+        self.recent_counts = {}  # cuenta -> deque con los últimos valores
+        self.overlay = False  # ¿Se dibuja el resumen encima del juego?
+        self._current = {}
+        self._counts = {}
+        self._last = self._start = 0.0
+        self._lines = []  # Texto del resumen ya dibujado, para no dibujarlo en cada fotograma
+        self._age = 0
+        self.enable(enabled)
+
+    def enable(self, enabled=True):
+        """Activa o desactiva las mediciones"""
+        self.enabled = enabled
+        if enabled:
+            self.begin, self.lap, self.count, self.end = self._begin, self._lap, self._count, self._end
+        else:
+            self.begin = self.lap = self.count = self.end = _noop
+
+    def _begin(self):
+        """Empieza un fotograma"""
+        self._current = {}
+        self._last = self._start = perf_counter()
+
+    def _lap(self, phase):
+        """Termina una fase: el tiempo desde la marca anterior se suma a esta fase"""
+        now = perf_counter()
+        current = self._current
+        current[phase] = current.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def _count(self, name, value):
+        """Guarda una cuenta del fotograma (por ejemplo, obstáculos dibujados), que se resume como las fases"""
+        self._counts[name] = value
+
+    def _end(self):
+        """Termina el fotograma y guarda sus tiempos"""
+        current = self._current
+        current["total"] = self._last - self._start
+        for phase, seconds in current.items():
+            recent = self.recent.get(phase)
+            if recent is None:
+                recent = self.recent[phase] = deque(maxlen=self.window)
+                self.phases.append(phase)
+            recent.append(seconds)
+        self.frames.append(current)
+        for name, value in self._counts.items():
+            recent = self.recent_counts.get(name)
+            if recent is None:
+                recent = self.recent_counts[name] = deque(maxlen=self.window)
+                self.counters.append(name)
+            recent.append(value)
+        self._counts = {}
+
+    def summary(self):
+        """
+        :return: diccionario fase -> {"p50", "p95", "p99", "mean", "max"} en milisegundos, sobre la ventana
+        """
+        result = {}
+        for phase in self.phases:
+            values = sorted(self.recent[phase])
+            stats = {f"p{p}": percentile(values, p) * 1000 for p in PERCENTILES}
+            stats["mean"] = sum(values) / len(values) * 1000 if values else 0.0
+            stats["max"] = values[-1] * 1000 if values else 0.0
+            result[phase] = stats
+        return result
+
+    def count_summary(self):
+        """
+        :return: diccionario cuenta -> {"p50", "p95", "p99", "mean", "max"}, sobre la ventana
+        """
+        result = {}
+        for name in self.counters:
+            values = sorted(self.recent_counts[name])
+            stats = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+            stats["mean"] = sum(values) / len(values) if values else 0.0
+            stats["max"] = values[-1] if values else 0
+            result[name] = stats
+        return result
+
+    def report(self):
+        """Resumen como texto, una fase por línea"""
+        lines = [f"{'fase':<14}" + "".join(f"{f'p{p}':>8}" for p in PERCENTILES) + f"{'max':>8}  (ms)"]
+        for phase, stats in self.summary().items():
+            lines.append(f"{phase:<14}" + "".join(f"{stats[f'p{p}']:8.2f}" for p in PERCENTILES)
+                         + f"{stats['max']:8.2f}")
+        counts = self.count_summary()
+        if counts:
+            lines.append(f"{'cuenta':<14}" + "".join(f"{f'p{p}':>8}" for p in PERCENTILES) + f"{'max':>8}")
+        for name, stats in counts.items():
+            lines.append(f"{name:<14}" + "".join(f"{stats[f'p{p}']:8}" for p in PERCENTILES) + f"{stats['max']:8}")
+        return "\n".join(lines)
+
+    def draw(self, surf, font, pos=(10, 40), color=(255, 255, 0), every=30):
+        """
+        Dibuja el resumen encima del juego si overlay es True
+        :param font: fuente de pygame con la que se escribe
+        :param every: fotogramas entre actualizaciones del texto
+        :return: rectángulos en los que se dibujó
+        """
+        if not self.overlay:
+            return []
+        self._age -= 1
+        if self._age <= 0 or not self._lines:
+            self._lines = [font.render(line, True, color) for line in self.report().splitlines()]
+            self._age = every
+        x, y = pos
+        return surf.blits([(line, (x, y + i * line.get_height())) for i, line in enumerate(self._lines)])
+
+    def dump(self, path):
+        """
+        Guarda los tiempos de cada fotograma (en milisegundos)
+        :param path: archivo .json (con el resumen de percentiles) o .csv (un fotograma por fila)
+        """
+        columns = self.phases
+        rows = [[round(frame.get(phase, 0.0) * 1000, 4) for phase in columns] for frame in self.frames]
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"phases": columns, "summary": self.summary(), "counts": self.count_summary(),
+                           "frames": rows}, f)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame"] + columns)
+                writer.writerows([i] + row for i, row in enumerate(rows))
@@ -0,0 +1,57 @@
+"""
+Dibujo del nivel.
+
+En vez de dibujar todos los obstáculos del nivel en cada fotograma, solo se dibujan los que caen dentro de la vista
+de la cámara (más un pequeño margen). Los candidatos se consultan en la cuadrícula del nivel, así que el costo de
+dibujar depende del tamaño de la pantalla y no del largo del nivel.
+"""
+
+
+class CulledRenderer:
+    """Dibuja solo los obstáculos visibles y lleva la cuenta de los dibujados y descartados en cada fotograma.
+    Con trozos precalculados, los obstáculos estáticos se cuentan aparte (chunk_tiles y static_culled)."""
+
+    def __init__(self, margin=64):
+        """
+        :param margin: píxeles extra alrededor de la vista que también se dibujan
+        """
+        self.margin = margin
+        self.drawn = 0  # Sprites dibujados uno por uno en el último fotograma
+        self.culled = 0  # Sprites de la cuadrícula descartados en el último fotograma
+        self.chunks = 0  # Trozos precalculados dibujados en el último fotograma
+        self.chunk_tiles = 0  # Obstáculos estáticos dentro de esos trozos
+        self.static_culled = 0  # Obstáculos estáticos fuera de esos trozos
+
+    def visible(self, camera, grid):
+        """Sprites del nivel dentro de la vista de la cámara más el margen, en orden de inserción"""
+        view = camera.view.inflate(self.margin * 2, self.margin * 2)
+        return [sprite for sprite in grid.query(view, 0) if view.colliderect(sprite.rect)]
+
+    def draw(self, surf, camera, grid, chunks=None, dirty=None):
+        """
+        Dibuja los obstáculos visibles del nivel
+        :param surf: superficie en la que se dibuja
+        :param camera: cámara con el desplazamiento de la vista
+        :param grid: cuadrícula con los obstáculos que se dibujan uno por uno
+        :param chunks: trozos precalculados con los obstáculos estáticos (ChunkCache), opcional
+        :param dirty: rectángulos sucios (DirtyRects) donde se anota lo dibujado, opcional
+        :return: número de sprites dibujados
+        """
+        self.chunks = chunks.draw(surf, camera) if chunks is not None else 0
+        self.chunk_tiles = chunks.drawn if chunks is not None else 0
+        self.static_culled = chunks.count - self.chunk_tiles if chunks is not None else 0
+        if self.chunks and dirty is not None:
+            dirty.add(surf.get_rect())  # Los trozos cubren casi toda la pantalla
+        sprites = self.visible(camera, grid)
+        rects = camera.draw(surf, sprites, dirty is not None and dirty.enabled)
+        if rects:
+            dirty.extend(rects)
+        self.drawn = len(sprites)
+        self.culled = len(grid) - self.drawn
+        return self.drawn
+
+    def stats(self):
+        """Cuenta del último fotograma: sprites dibujados uno por uno, trozos precalculados y el total de obstáculos"""
+        return {"sprites_drawn": self.drawn, "sprites_culled": self.culled, "chunk_blits": self.chunks,
+                "chunk_tiles": self.chunk_tiles, "tiles_drawn": self.drawn + self.chunk_tiles,
+                "tiles_culled": self.culled + self.static_culled}
@@ -0,0 +1,182 @@
+"""
+Grabación y reproducción de partidas.
+
+Una partida queda determinada por el nivel y el bit de salto (flecha arriba o espacio) de cada paso: la física de
+sim.py no depende del reloj ni del azar. Una repetición guarda el nivel (su ruta y una huella de su contenido), los
+bits en rachas (cuántos pasos seguidos sin saltar, cuántos saltando, ...) y el resultado que tuvo la partida.
+
+Volver a simularla sin ventana sirve para reproducir reportes de errores y para comprobar que un cambio en la física
+no rompe partidas que antes se completaban:
+
+    python replay.py verify repeticiones/*.json
+    python replay.py show repeticion.json --speed 2  # en pantalla, al doble de la velocidad normal
+
+El juego graba cada intento si la variable PYDASH_RECORD tiene una carpeta, y reproduce una repetición en pantalla
+con PYDASH_REPLAY (y PYDASH_REPLAY_SPEED; 0 es lo más rápido posible).
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+from levels import load_level
+from sim import Simulation
+
+FORMAT = 1
+CHECKED = ("won", "died", "ticks", "coins", "column")  # Resultados que debe repetir la simulación
+
+
+def encode(inputs):
+    """
+    Rachas de una secuencia de bits; la primera racha es sin saltar (puede ser 0)
+    :return: lista de largos, alternando sin saltar y saltando
+    """
+    runs = []
+    current = False
+    length = 0
+    for pressed in inputs:
+        if bool(pressed) != current:
+            runs.append(length)
+            current = not current
+            length = 0
+        length += 1
+    runs.append(length)
+    return runs
+
+
+def decode(runs):
+    """Secuencia de bits a partir de sus rachas (ver encode)"""
+    inputs = []
+    for i, length in enumerate(runs):
+        inputs += [i % 2 == 1] * length
+    return inputs
+
+
+def level_id(path):
+    """Huella del contenido de un nivel (tipos de casilla y tamaño), para saber si cambió desde la grabación"""
+    kinds = load_level(path)
+    return hashlib.sha1(repr(kinds.shape).encode() + kinds.tobytes()).hexdigest()[:16]
+
+
+class Replay:
+    """Un intento: nivel, bits de salto y resultado"""
+
+    def __init__(self, level, inputs=(), result=None, level_hash=None):
+        """
+        :param level: ruta del nivel CSV
+        :param inputs: bits de salto, uno por paso
+        :param result: resultado de la partida grabada (como Simulation.result)
+        :param level_hash: huella del nivel al grabar; por defecto la del nivel actual
+        """
+        self.level = level
+        self.inputs = list(inputs)
+        self.result = result
+        self.level_hash = level_hash or level_id(level)
+
+    def save(self, path):
+        data = {"format": FORMAT, "level": self.level, "level_id": self.level_hash, "ticks": len(self.inputs),
+                "runs": encode(self.inputs), "result": self.result}
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("format") != FORMAT:
+            raise ValueError(f"{path}: formato de repetición desconocido ({data.get('format')})")
+        return cls(data["level"], decode(data["runs"]), data.get("result"), data["level_id"])
+
+    def simulate(self, sim=None):
+        """
+        Vuelve a jugar la partida sin ventana, a toda velocidad
+        :param sim: simulación del nivel ya creada (para reutilizarla entre repeticiones del mismo nivel)
+        :return: resultado de la simulación
+        """
+        sim = sim or Simulation(load_level(self.level))
+        return sim.run(self.inputs, max_ticks=len(self.inputs))
+
+    def verify(self, sim=None):
+        """
+        Compara la simulación con el resultado grabado
+        :return: lista de diferencias (texto); vacía si la partida se repite igual
+        """
+        problems = []
+        if level_id(self.level) != self.level_hash:
+            problems.append(f"el nivel {self.level} cambió desde la grabación")
+        result = self.simulate(sim)
+        for key in CHECKED:
+            if self.result is not None and key in self.result and result[key] != self.result[key]:
+                problems.append(f"{key}: grabado {self.result[key]}, simulado {result[key]}")
+        return problems
+
+
+class Recorder:
+    """Graba cada intento del juego en una carpeta"""
+
+    def __init__(self, folder):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        self.level = None
+        self.inputs = []
+        self.saved = 0
+
+    def start(self, level):
+        """Empieza un intento en un nivel"""
+        self.level = level
+        self.inputs = []
+
+    def record(self, pressed):
+        """Guarda el bit de salto de un paso"""
+        self.inputs.append(bool(pressed))
+
+    def finish(self, result):
+        """
+        Termina el intento y lo guarda (si tuvo algún paso)
+        :return: ruta de la repetición, o None
+        """
+        if self.level is None or not self.inputs:
+            return None
+        name = os.path.splitext(os.path.basename(self.level))[0]
+        path = os.path.join(self.folder, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{self.saved:04d}.json")
+        Replay(self.level, self.inputs, result).save(path)
+        self.saved += 1
+        self.inputs = []
+        return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica o muestra repeticiones de partidas")
+    commands = parser.add_subparsers(dest="command", required=True)
+    verify = commands.add_parser("verify", help="vuelve a simular las repeticiones sin ventana y compara")
+    verify.add_argument("replays", nargs="+")
+    show = commands.add_parser("show", help="muestra una repetición en el juego")
+    show.add_argument("replay")
+    show.add_argument("--speed", type=float, default=1.0, help="múltiplo de la velocidad normal; 0 = sin límite")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        env = dict(os.environ, PYDASH_REPLAY=args.replay, PYDASH_REPLAY_SPEED=str(args.speed))
+        return subprocess.call([sys.executable, "main.py"], env=env)
+
+    failed = 0
+    sims = {}  # nivel -> Simulation, creada una sola vez
+    start = time.perf_counter()
+    for path in args.replays:
+        replay = Replay.load(path)
+        if replay.level not in sims:
+            sims[replay.level] = Simulation(load_level(replay.level))
+        problems = replay.verify(sims[replay.level])
+        if problems:
+            failed += 1
+            print(f"{path}: DISTINTA; " + "; ".join(problems))
+    print(f"{len(args.replays) - failed}/{len(args.replays)} repeticiones iguales "
+          f"({time.perf_counter() - start:.2f} s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Caché de rotaciones de una imagen.
+
+Rotar una imagen con rotozoom en cada fotograma es caro. Aquí el ángulo se redondea a pasos fijos (1 grado por
+defecto) y cada rotación se calcula una sola vez, junto con el desplazamiento que deja el pivote en su lugar.
+Después, dibujar la imagen rotada es buscar en un diccionario y hacer un blit. Sirve para el jugador y para
+cualquier otro sprite que gire, como los orbes.
+"""
+import pygame
+from pygame.math import Vector2
+
+
+class RotationCache:
+    """Rotaciones de una imagen alrededor de un pivote, calculadas una sola vez por ángulo redondeado"""
+
+    def __init__(self, image, originpos, step=1.0):
+        """
+        :param image: imagen a rotar
+        :param originpos: posición x, y del pivote dentro de la imagen
+        :param step: tamaño del paso de ángulo en grados
+        """
+        self.image = image
+        self.originpos = originpos
+        self.step = step
+        self.count = max(1, round(360 / step))  # Ángulos distintos posibles
+        self.frames = {}  # índice del ángulo -> (imagen rotada, desplazamiento)
+        self.hits = 0
+        self.misses = 0
+
+    def index(self, angle):
+        """Índice del ángulo redondeado al paso más cercano"""
+        return round(angle / self.step) % self.count
+
+    def build(self, index):
+        """Rota la imagen al ángulo del índice y calcula dónde queda la esquina superior izquierda"""
+        angle = index * self.step
+        w, h = self.image.get_size()
+        ox, oy = self.originpos
+
+        # Calcula el cuadro delimitador alineado al eje de la imagen rotada
+        box = [Vector2(p).rotate(angle) for p in [(0, 0), (w, 0), (w, -h), (0, -h)]]
+        min_x = min(p[0] for p in box)
+        max_y = max(p[1] for p in box)
+
+        # Calcula la traslación del pivote
+        pivot = Vector2(ox, -oy)
+        pivot_move = pivot.rotate(angle) - pivot
+
+        # Desplazamiento de la esquina superior izquierda respecto a la posición del pivote
+        offset = (-ox + min_x - pivot_move[0], -oy - max_y + pivot_move[1])
+        return pygame.transform.rotozoom(self.image, angle, 1), offset
+
+    def get(self, angle):
+        """
+        :return: (imagen rotada, desplazamiento) para el ángulo redondeado
+        """
+        index = self.index(angle)
+        frame = self.frames.get(index)
+        if frame is None:
+            self.misses += 1
+            frame = self.frames[index] = self.build(index)
+        else:
+            self.hits += 1
+        return frame
+
+    def blit(self, surf, pos, angle):
+        """
+        Dibuja la imagen rotada con el pivote en pos
+        :param surf: superficie en la que se dibuja
+        :param pos: posición del pivote en la superficie
+        :param angle: ángulo de rotación en grados
+        :return: rectángulo en el que se dibujó
+        """
+        image, (dx, dy) = self.get(angle)
+        return surf.blit(image, (pos[0] + dx, pos[1] + dy))
@@ -0,0 +1,148 @@
+"""
+Corre muchas partidas (nivel y secuencia de saltos) en varios procesos.
+
+Cada trabajo es un nivel y una secuencia de bits de salto; los trabajos se reparten entre los procesos de un
+multiprocessing.Pool. Cada proceso crea la simulación de un nivel una sola vez y la reutiliza para todos los trabajos
+de ese nivel. Los resultados se escriben como líneas JSON a medida que terminan (victoria o muerte, monedas, columna,
+pasos y tiempo de cada trabajo), y al final se muestra un resumen.
+
+Los trabajos salen de:
+  - repeticiones (.json, ver replay.py): además se compara con el resultado grabado;
+  - archivos de trabajos (.jsonl): una línea por trabajo con "level" y "runs" (rachas, como las repeticiones)
+    o "inputs" (texto de 0 y 1);
+  - niveles (.csv): --random secuencias aleatorias por nivel.
+
+    python runner.py repeticiones/*.json --workers 8 > resultados.jsonl
+    python runner.py level_1.csv level_2.csv --random 10000
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # El saludo de pygame mezclaría texto con las líneas JSON
+
+from levels import load_level
+from replay import Replay, decode, encode
+from sim import SPEED, TICK_RATE, Simulation
+
+_sims = {}  # Simulaciones ya creadas en este proceso: ruta del nivel -> Simulation
+
+
+def simulation(level):
+    """Simulación de un nivel, creada una sola vez por proceso"""
+    sim = _sims.get(level)
+    if sim is None:
+        sim = _sims[level] = Simulation(load_level(level))
+    return sim
+
+
+def run_job(job):
+    """
+    Juega un trabajo (en un proceso del pool)
+    :param job: diccionario con id, level, runs y, si viene de una repetición, source y expected
+    :return: diccionario con el resultado
+    """
+    start = time.perf_counter()
+    sim = simulation(job["level"])
+    inputs = decode(job["runs"])
+    result = sim.run(inputs, max_ticks=len(inputs) if "expected" in job else None)
+    out = {"job": job["id"], "level": job["level"], "source": job.get("source")}
+    out.update(result)
+    expected = job.get("expected")
+    if expected is not None:
+        out["matches"] = all(result[key] == expected[key] for key in result if key in expected)
+    out["seconds"] = time.perf_counter() - start
+    out["worker"] = os.getpid()
+    return out
+
+
+def random_runs(rng, ticks, press=0.3):
+    """Rachas aleatorias de salto presionado o suelto, como las de las pruebas de rendimiento"""
+    inputs = []
+    while len(inputs) < ticks:
+        inputs += [rng.random() < press] * rng.randint(1, 20)
+    return encode(inputs[:ticks])
+
+
+def jobs_from(paths, randoms=0, seed=1):
+    """Genera los trabajos de una lista de archivos (repeticiones, archivos de trabajos o niveles)"""
+    rng = random.Random(seed)
+    count = 0
+    for path in paths:
+        if path.endswith(".jsonl"):
+            with open(path) as f:
+                for number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    runs = data["runs"] if "runs" in data else encode(bit == "1" for bit in data["inputs"])
+                    yield {"id": count, "level": data["level"], "runs": runs, "source": f"{path}:{number}"}
+                    count += 1
+        elif path.endswith(".json"):
+            replay = Replay.load(path)
+            yield {"id": count, "level": replay.level, "runs": encode(replay.inputs), "source": path,
+                   "expected": replay.result}
+            count += 1
+        else:
+            ticks = load_level(path).shape[1] * 32 // SPEED + 2 * TICK_RATE
+            for _ in range(randoms):
+                yield {"id": count, "level": path, "runs": random_runs(rng, ticks), "source": "random"}
+                count += 1
+
+
+def run(jobs, workers=None, chunksize=16, out=sys.stdout):
+    """
+    Corre los trabajos y escribe cada resultado como una línea JSON en cuanto termina
+    :param workers: procesos del pool; por defecto uno por núcleo, 0 corre todo en este proceso
+    :return: resumen (diccionario)
+    """
+    summary = {"jobs": 0, "won": 0, "died": 0, "mismatches": 0}
+    start = time.perf_counter()
+    pool = multiprocessing.Pool(workers) if workers != 0 else None
+    try:
+        results = pool.imap_unordered(run_job, jobs, chunksize) if pool is not None else map(run_job, jobs)
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            summary["jobs"] += 1
+            summary["won"] += result["won"]
+            summary["died"] += result["died"]
+            summary["mismatches"] += result.get("matches") is False
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    summary["seconds"] = time.perf_counter() - start
+    summary["workers"] = workers if workers is not None else os.cpu_count()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Corre muchas partidas en varios procesos")
+    parser.add_argument("paths", nargs="+", help="repeticiones (.json), trabajos (.jsonl) o niveles (.csv)")
+    parser.add_argument("--random", type=int, default=0, help="secuencias aleatorias por cada nivel .csv")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None, help="procesos; por defecto uno por núcleo")
+    parser.add_argument("--chunksize", type=int, default=16, help="trabajos que se envían juntos a un proceso")
+    parser.add_argument("--out", help="archivo de resultados (por defecto la salida estándar)")
+    args = parser.parse_args(argv)
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        summary = run(jobs_from(args.paths, args.random, args.seed), args.workers, args.chunksize, out)
+    finally:
+        if args.out:
+            out.close()
+    rate = summary["jobs"] / summary["seconds"] if summary["seconds"] else 0
+    print(f"{summary['jobs']} trabajos en {summary['seconds']:.2f} s ({rate:,.0f}/s, {summary['workers']} procesos): "
+          f"{summary['won']} ganadas, {summary['died']} muertes, {summary['mismatches']} repeticiones distintas",
+          file=sys.stderr)
+    return 1 if summary["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
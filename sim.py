@@ -0,0 +1,286 @@
+"""
+Núcleo de simulación del juego, sin pantalla.
+
+Aquí están las reglas de física del jugador (gravedad, salto, orbes y colisiones). No dibuja nada ni depende de la
+ventana, del teclado ni de las pantallas de victoria o muerte, así que se puede avanzar el juego de a un paso (un
+fotograma a 60 FPS) a partir de un solo bit de entrada: ¿está presionado el salto? Sirve para validar niveles sin
+ventana y para bots, a decenas de miles de pasos por segundo.
+
+    sim = Simulation(read_level("level_1.csv"))
+    result = sim.run(inputs)  # inputs: secuencia de True/False, uno por paso
+"""
+import csv
+
+import pygame
+from pygame.math import Vector2
+
+from grid import TileGrid
+
+TICK_RATE = 60  # Pasos de simulación por segundo (el juego original avanza un paso por fotograma a 60 FPS)
+TILE = 32  # Tamaño de las casillas del nivel
+SPEED = 6  # Píxeles que avanza el jugador en cada paso
+GRAVITY = Vector2(0, 0.86)  # Vector de gravedad para el jugador
+MAX_FALL = 100  # Velocidad máxima de caída
+JUMP_AMOUNT = 12  # Fuerza del salto al empezar, y la del salto en el aire de los orbes
+AFTER_ORB_JUMP = 10  # Fuerza con la que queda el salto después de usar un orbe
+START = (150, 150)  # Posición inicial (centro) del jugador
+
+# Tipos de casilla
+EMPTY, PLATFORM, SPIKE, COIN, ORB, TRICK, END = range(7)
+
+# Texto de cada casilla en los archivos CSV de los niveles
+TILES = {"0": PLATFORM, "Spike": SPIKE, "Coin": COIN, "Orb": ORB, "T": TRICK, "End": END}
+
+# Tamaño de cada tipo de casilla; End usa la imagen del avatar sin escalar (121x120)
+TILE_SIZES = {END: (121, 120)}
+
+
+def read_level(path):
+    """
+    Abre un archivo CSV que contiene el mapa de un nivel
+    :return: lista de filas; cada fila es una lista con el texto de cada casilla
+    """
+    with open(path, newline='') as csvfile:
+        return [row for row in csv.reader(csvfile, delimiter=',', quotechar='"')]
+
+
+class Tile:
+    """Casilla del nivel, sin imagen: solo su tipo y su rectángulo en coordenadas del mundo"""
+    __slots__ = ("kind", "rect")
+
+    def __init__(self, kind, rect):
+        self.kind = kind
+        self.rect = rect
+
+
+def build_tiles(level):
+    """
+    Crea las casillas de un nivel, en el mismo orden que init_level (fila por fila)
+    :param level: lista de filas con el texto de cada casilla, o arreglo de tipos de casilla (ver levels.py)
+    :return: lista de Tile
+    """
+    if hasattr(level, "tolist"):
+        level = level.tolist()
+    tiles = []
+    for y, row in enumerate(level):
+        for x, cell in enumerate(row):
+            kind = TILES.get(cell) if isinstance(cell, str) else cell or None
+            if kind is not None:
+                tiles.append(Tile(kind, pygame.Rect((x * TILE, y * TILE), TILE_SIZES.get(kind, (TILE, TILE)))))
+    return tiles
+
+
+class Body:
+    """Física del jugador. Player (en main.py) la usa para el juego en pantalla y Simulation para el juego sin ventana."""
+
+    def __init__(self, pos=START, grid=None):
+        """
+        :param pos: posición inicial (centro) del jugador
+        :param grid: cuadrícula con las casillas del nivel (TileGrid)
+        """
+        self.grid = grid
+        self.rect = pygame.Rect(0, 0, 32, 32)
+        self.rect.center = pos
+        self.onGround = False  # ¿El jugador está en el suelo?
+        self.died = False  # ¿El jugador ha muerto?
+        self.win = False  # ¿El jugador ha ganado el nivel?
+        self.jump_amount = JUMP_AMOUNT  # Fuerza del salto
+        self.isjump = False  # ¿El jugador está saltando?
+        self.pressed = False  # ¿Está presionado el salto en este paso?
+        self.coins = 0  # Monedas recogidas
+        self.vel = Vector2(0, 0)  # Velocidad inicial en cero
+
+    def nearby(self):
+        """Casillas cercanas al jugador, consultadas en la cuadrícula del nivel"""
+        return self.grid.query(self.rect)
+
+    def activate_orb(self, orb):
+        """Salto en el aire al tocar un orbe con el salto presionado"""
+        self.jump_amount = JUMP_AMOUNT  # Aumenta la fuerza de salto al tocar un orbe
+        self.jump()
+        self.jump_amount = AFTER_ORB_JUMP  # Restaura la fuerza de salto
+
+    def collect(self, coin):
+        """Recoge una moneda y la borra del nivel"""
+        self.coins += 1
+        coin.rect.x = 0
+        coin.rect.y = 0
+
+    def collide(self, yvel, platforms):
+        """Gestiona las colisiones del jugador con las plataformas y otros objetos."""
+        for p in platforms:
+            if self.rect.colliderect(p.rect):
+                kind = p.kind
+                if kind == ORB and self.pressed:
+                    self.activate_orb(p)
+
+                if kind == END:
+                    self.win = True  # Marca victoria al llegar al final del nivel
+
+                if kind == SPIKE:
+                    self.died = True  # Marca muerte al tocar un pico
+
+                if kind == COIN:
+                    self.collect(p)
+
+                if kind == PLATFORM:
+                    if yvel > 0:
+                        # Si el jugador está cayendo (yvel es positivo)
+                        self.rect.bottom = p.rect.top  # Evita que el jugador atraviese el suelo
+                        self.vel.y = 0  # Restaura la velocidad en y porque el jugador está en el suelo
+                        self.onGround = True
+                        self.isjump = False  # Reinicia el salto
+                    elif yvel < 0:
+                        # Si yvel es negativo, el jugador colisionó mientras saltaba, como si golpeara su cabeza
+                        self.rect.top = p.rect.bottom
+                    else:
+                        # De lo contrario, si el jugador choca con un bloque, muere
+                        self.vel.x = 0
+                        self.rect.right = p.rect.left  # Evita que el jugador atraviese paredes
+                        self.died = True
+
+    def jump(self):
+        """Hace que el jugador salte"""
+        self.vel.y = -self.jump_amount
+
+    def snapshot(self):
+        """Estado de la física del jugador en una tupla, para guardarlo y volver a él con restore"""
+        return (self.rect.x, self.rect.y, self.vel.x, self.vel.y, self.onGround, self.isjump, self.jump_amount,
+                self.died, self.win, self.coins)
+
+    def restore(self, state):
+        """Vuelve al estado guardado con snapshot (no devuelve las monedas al nivel)"""
+        (self.rect.x, self.rect.y, self.vel.x, self.vel.y, self.onGround, self.isjump, self.jump_amount,
+         self.died, self.win, self.coins) = state
+
+    def update(self, pressed=False):
+        """
+        Avanza un paso de física
+        :param pressed: ¿está presionado el salto (espacio o flecha arriba)?
+        """
+        self.pressed = pressed
+        if pressed:
+            self.isjump = True
+
+        if self.isjump:
+            if self.onGround:
+                # Solo se permite saltar desde el suelo
+                self.jump()
+
+        if not self.onGround:  # Acelera con la gravedad solo si está en el aire
+            self.vel += GRAVITY
+
+            # Velocidad máxima de caída
+            if self.vel.y > MAX_FALL:
+                self.vel.y = MAX_FALL
+
+        # Colisiones en el eje X
+        self.collide(0, self.nearby())
+
+        # Incremento en la dirección Y
+        self.rect.top += self.vel.y
+
+        # Se asume que el jugador está en el aire; si no, se ajustará en collide
+        self.onGround = False
+
+        # Colisiones en el eje Y
+        self.collide(self.vel.y, self.nearby())
+
+
+class LevelSnapshot:
+    """
+    Estado inicial de un nivel: el del jugador y la posición de cada moneda (recoger una la mueve a 0, 0).
+    Reiniciar con restore devuelve todo a su lugar sin crear objetos, y cuesta lo que cuestan el jugador y las
+    monedas; las demás casillas nunca se mueven.
+    """
+
+    def __init__(self, body, tiles):
+        """
+        :param body: jugador (Body o Player) en su posición inicial
+        :param tiles: casillas del nivel (Tile o los sprites de main.py); se guardan solo las monedas
+        """
+        self.body = body
+        self.state = body.snapshot()
+        self.coins = [(tile.rect, tile.rect.topleft) for tile in tiles if tile.kind == COIN]
+
+    def restore(self):
+        """Devuelve el jugador y las monedas al estado inicial"""
+        for rect, topleft in self.coins:
+            rect.topleft = topleft
+        self.body.restore(self.state)
+
+
+class Simulation:
+    """Un nivel y un jugador que avanzan de a un paso fijo, sin ventana"""
+
+    def __init__(self, level, start=START):
+        """
+        :param level: lista de filas con el texto de cada casilla (como read_level) o arreglo de tipos de casilla
+        :param start: posición inicial (centro) del jugador
+        """
+        self.start = start
+        self.tiles = build_tiles(level)
+        self.width = max(len(row) for row in level) * TILE
+        self.height = len(level) * TILE
+
+        self.grid = TileGrid(TILE)
+        for tile in self.tiles:
+            self.grid.insert(tile)
+        self.body = Body(start, self.grid)
+        self.initial = LevelSnapshot(self.body, self.tiles)
+        self.reset()
+
+    def reset(self):
+        """Regresa el jugador al inicio y devuelve las monedas a su lugar"""
+        self.initial.restore()
+        self.tick = 0
+        self.fell = False
+
+    @property
+    def done(self):
+        """¿Terminó la partida (victoria, muerte o caída fuera del nivel)?"""
+        body = self.body
+        return body.win or body.died or self.fell or body.rect.left >= self.width
+
+    def step(self, pressed=False):
+        """
+        Avanza un paso: física del jugador y avance horizontal (lo que en pantalla hace la cámara)
+        :param pressed: ¿está presionado el salto?
+        :return: True si la partida sigue
+        """
+        body = self.body
+        body.vel.x = SPEED
+        body.update(pressed)
+        body.rect.x += body.vel.x
+        self.tick += 1
+
+        # En el juego el jugador caería para siempre; aquí se cuenta como muerte
+        if body.rect.top > self.height:
+            self.fell = True
+        return not self.done
+
+    def run(self, inputs=(), max_ticks=None):
+        """
+        Juega una partida completa desde el inicio
+        :param inputs: bits de salto, uno por paso; al acabarse se sigue sin saltar
+        :param max_ticks: límite de pasos; por defecto lo necesario para recorrer el nivel
+        :return: diccionario con el resultado
+        """
+        self.reset()
+        if max_ticks is None:
+            max_ticks = self.width // SPEED + 2 * TICK_RATE
+        inputs = iter(inputs)
+        while self.tick < max_ticks and self.step(next(inputs, False)):
+            pass
+        return self.result()
+
+    def result(self):
+        """Resultado de la partida actual"""
+        body = self.body
+        return {
+            "won": body.win,
+            "died": body.died or self.fell,
+            "ticks": self.tick,
+            "coins": body.coins,
+            "column": body.rect.left // TILE,
+        }
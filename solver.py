@@ -0,0 +1,383 @@
+"""
+Verifica si un nivel se puede completar.
+
+Busca, paso a paso, una secuencia de saltos (el mismo bit que activa los orbes) que llegue al final del nivel usando
+la física de sim.py. Los estados del jugador (x, y, velocidad vertical, en el suelo, salto pendiente y fuerza del
+salto) se guardan en una tabla: un estado que ya se exploró no se vuelve a explorar, así que la búsqueda recorre cada
+estado posible a lo sumo una vez en vez de probar todas las secuencias.
+
+Casi todos los pasos (en el aire sin tocar nada, o cayendo sobre plataformas) se calculan con la gravedad y el avance,
+sin pasar por la cuadrícula, y los pasos del medio de un salto, donde no hay nada que decidir, no se guardan en la
+tabla. Así un nivel de miles de columnas sin solución se recorre entero en pocos segundos; si aun así se pasa del
+límite de estados o de tiempo, el resultado dice hasta dónde se alcanzó a explorar (exhausted).
+
+Si el nivel se puede completar devuelve una secuencia que lo completa; si no, la columna más lejana a la que llega
+alguna secuencia: ahí muere la última rama, y ninguna pasa de ella. Un nivel sin End no se busca, y si alguna rama
+sale por el borde derecho sin tocar el End no hay una muerte inevitable: se informa aparte.
+
+    python solver.py level_1.csv level_2.csv
+    python solver.py level_1.csv --windows  # también muestra en qué pasos se puede saltar
+"""
+import argparse
+import sys
+import time
+
+import pygame
+
+from levels import load_level, to_kinds
+from sim import END, GRAVITY, MAX_FALL, ORB, PLATFORM, SPEED, SPIKE, TILE, Body, Simulation, build_tiles
+
+MAX_STATES = 2_000_000  # Límite de estados explorados por nivel
+MAX_SECONDS = 10.0  # Límite de tiempo por nivel en la línea de comandos
+
+
+class _Probe(Body):
+    """Física del jugador para la búsqueda: no recoge las monedas, que no cambian la física (el nivel se comparte
+    entre todas las ramas; solve las cuenta después con la simulación normal)"""
+
+    def collect(self, coin):
+        pass
+
+
+def _rows(top, bottom):
+    """Filas de top a bottom (inclusive) como bits; las filas sobre el nivel no tienen casillas"""
+    return 0 if bottom < 0 else (1 << bottom + 1) - (1 << max(top, 0))
+
+
+def _key(state):
+    """
+    Parte del estado que decide el futuro: x, y, velocidad vertical, en el suelo y fuerza del salto.
+    isjump no cuenta: al aterrizar siempre vuelve a False, y solo se usa en el suelo.
+    """
+    x, y, _, vel_y, on_ground, _, jump_amount = state[:7]
+    return x, y, vel_y, on_ground, jump_amount
+
+
+class Solver:
+    """Búsqueda en profundidad con tabla de estados sobre un nivel"""
+
+    def __init__(self, level, max_states=MAX_STATES, max_seconds=None):
+        """
+        :param level: arreglo de tipos de casilla (levels.load_level) o filas de texto (sim.read_level)
+        :param max_states: límite de estados explorados
+        :param max_seconds: límite de tiempo de solve, o None para no tener límite
+        """
+        self.level = level
+        self.sim = Simulation(level)
+        self.sim.body = _Probe(self.sim.start, self.sim.grid)
+        # Por columna, las filas (como bits) con casillas que cambian algo al tocarlas (las monedas y las trampas no),
+        # las que tienen solo una plataforma y las que tienen algún orbe
+        self.solid, self.platforms, self.orbs = {}, {}, {}
+        kinds = {}  # (columna, fila) -> tipos de las casillas que tocan esa celda
+        for tile in build_tiles(level):
+            rect = tile.rect
+            for col in range(rect.left // TILE, (rect.right - 1) // TILE + 1):
+                for row in range(rect.top // TILE, (rect.bottom - 1) // TILE + 1):
+                    kinds.setdefault((col, row), set()).add(tile.kind)
+        for (col, row), cell in kinds.items():
+            cell = cell & {PLATFORM, SPIKE, END, ORB}
+            for masks, present in ((self.solid, cell - {ORB}), (self.platforms, cell == {PLATFORM}),
+                                   (self.orbs, ORB in cell)):
+                if present:
+                    masks[col] = masks.get(col, 0) | 1 << row
+        self.rect = pygame.Rect(0, 0, 32, 32)  # Para redondear la altura como el jugador (ver _glide)
+        self.max_states = max_states
+        self.max_seconds = max_seconds
+        self.deadline = None  # perf_counter en que se acaba el tiempo de solve
+        self.timed_out = False  # ¿Se acabó el tiempo?
+        self.visited = set()  # Estados explorados; los que no están en policy no pueden ganar
+        self.policy = {}  # Estado desde el que se sabe ganar -> bit de salto que hay que usar
+        self.states = 0  # Estados explorados
+        self.furthest = 0  # Columna más lejana a la que llegó alguna rama
+        self.off_edge = False  # ¿Alguna rama salió por el borde derecho sin tocar el End?
+
+    def _glide(self, state, pressed):
+        """
+        Un paso sin pasar por la cuadrícula, cuando el jugador no toca ninguna casilla antes ni después de moverse, o
+        solo cae sobre plataformas: collide no hace nada, o solo lo deja en el suelo, así que Body.update y
+        Simulation.step se reducen a la gravedad, el salto y el avance. Son casi todos los pasos de un nivel.
+        :return: el nuevo estado, o None si el paso no es así (o termina la partida) y hay que darlo completo
+        """
+        x, y, _, vel_y, on_ground, isjump, jump_amount, died, win, coins = state
+        left, right = x // TILE, (x + 31) // TILE
+        solid, platforms = self.solid, self.platforms
+        tiles = solid.get(left, 0) | solid.get(right, 0)
+        others = solid.get(left, 0) ^ platforms.get(left, 0) | solid.get(right, 0) ^ platforms.get(right, 0)
+        if pressed:
+            # Con el salto presionado, tocar un orbe salta
+            orbs = self.orbs.get(left, 0) | self.orbs.get(right, 0)
+            tiles |= orbs
+            others |= orbs
+        if tiles & _rows(y // TILE, (y + 31) // TILE):
+            return None
+        isjump = isjump or pressed
+        if isjump and on_ground:
+            vel_y = float(-jump_amount)
+        elif not on_ground:
+            vel_y = min(vel_y + GRAVITY.y, float(MAX_FALL))
+        rect = self.rect
+        rect.top = y
+        rect.top += vel_y  # Redondea igual que el jugador
+        y = rect.top
+        on_ground = False
+        touched = tiles & _rows(y // TILE, (y + 31) // TILE)
+        if touched:
+            # Solo sigue si cae sobre plataformas de la fila de abajo: queda parado encima
+            row = (y + 31) // TILE
+            below = _rows(row, row)
+            if vel_y <= 0 or y // TILE == row or touched != below or others & below:
+                return None
+            y = (row - 1) * TILE
+            vel_y = 0.0
+            on_ground = True
+            isjump = False
+        if y > self.sim.height or x + SPEED >= self.sim.width:
+            return None
+        return x + SPEED, y, float(SPEED), vel_y, on_ground, isjump, jump_amount, died, win, coins
+
+    def _step(self, state, tick, pressed):
+        """
+        Avanza un paso desde un estado guardado; devuelve el nuevo estado y si la partida sigue. Si la partida
+        terminó, sim.body y sim.fell tienen cómo terminó.
+        """
+        new = self._glide(state, pressed)
+        if new is not None:
+            return new, True
+        sim = self.sim
+        sim.body.restore(state)
+        sim.tick = tick
+        sim.fell = False
+        running = sim.step(pressed)
+        return sim.body.snapshot(), running
+
+    def _matters(self, state):
+        """¿Puede cambiar algo presionar el salto? Solo en el suelo o con un orbe al alcance"""
+        x, y, _, vel_y, on_ground = state[:5]
+        if on_ground:
+            return True
+        # Las mismas celdas que consultaría la cuadrícula (query, con una celda de margen)
+        orbs = 0
+        for col in range(x // TILE - 1, (x + 31) // TILE + 2):
+            orbs |= self.orbs.get(col, 0)
+        if not orbs:
+            return False
+        reach = int(abs(vel_y)) + 2  # Lo que puede moverse el jugador en este paso
+        return bool(orbs & _rows((y - reach) // TILE - 1, (y + 31 + reach) // TILE + 1))
+
+    def _fly(self, state, tick):
+        """
+        Avanza sin saltar desde un estado en que saltar no cambia nada, y sigue mientras el jugador vaya por el aire
+        sin tocar casillas ni tener orbes cerca (ver _glide). Esos pasos no se guardan en la tabla: dos ramas solo
+        pueden llegar al mismo estado después de tocar algo, o donde se decide.
+        :return: (estado, si la partida sigue, pasos)
+        """
+        new, running = self._step(state, tick, False)
+        if not running or new[4]:
+            return new, running, 1
+        x, y, vel_x, vel_y, on_ground, isjump, jump_amount, died, win, coins = new
+        tiles, orbs, rect = self.solid, self.orbs, self.rect
+        bottom, right = self.sim.height, self.sim.width - SPEED
+        steps = 1
+        # Lo mismo que _glide en el aire sin tocar nada, con el estado en variables
+        while x < right:
+            column = x // TILE
+            if column - 1 in orbs or column in orbs or column + 1 in orbs or column + 2 in orbs:
+                break
+            near = tiles.get(column, 0) | tiles.get((x + 31) // TILE, 0)
+            speed = min(vel_y + GRAVITY.y, float(MAX_FALL))
+            rect.top = y
+            rect.top += speed  # Redondea igual que el jugador
+            if near & _rows(min(y, rect.top) // TILE, (max(y, rect.top) + 31) // TILE) or rect.top > bottom:
+                break
+            x += SPEED
+            y = rect.top
+            vel_y = speed
+            steps += 1
+        return (x, y, vel_x, vel_y, on_ground, isjump, jump_amount, died, win, coins), running, steps
+
+    def _follow(self, state, tick):
+        """Secuencia que gana desde un estado que ya está en policy"""
+        inputs = []
+        while True:
+            pressed = self.policy.get(_key(state), False)  # Los pasos de _fly no están: no se salta
+            inputs.append(pressed)
+            state, _ = self._step(state, tick, pressed)
+            tick += 1
+            if state[8]:  # win (ver Body.snapshot)
+                return inputs
+
+    def _won(self, keys, bits, inputs, state=None, tick=0):
+        """Guarda en policy el camino ganador y devuelve la secuencia completa"""
+        for key, pressed in zip(keys, bits):
+            self.policy[key] = pressed
+        return inputs + (self._follow(state, tick) if state is not None else [])
+
+    def search(self, state, tick=0):
+        """
+        Busca una secuencia de saltos que gane desde un estado
+        :return: lista de bits de salto, o None si no se puede ganar (o se pasó del límite de estados)
+        """
+        key = _key(state)
+        if key in self.policy:
+            return self._follow(state, tick)
+        if key in self.visited:
+            return None
+        self.visited.add(key)
+
+        keys = [key]  # Estados guardados del camino actual
+        bits = []  # Bit de salto usado en cada uno (el último todavía no tiene)
+        inputs = []  # Bits de salto del camino actual, uno por paso
+        stack = [(state, tick, 0, 0, 0)]  # (estado, paso, siguiente opción, largo de keys e inputs antes de él)
+        while stack:
+            state, tick, choice, saved, length = stack[-1]
+            if choice == 2:
+                # Ninguna opción gana desde este estado: queda en visited sin entrar en policy
+                stack.pop()
+                del keys[saved:], bits[saved - 1:], inputs[length:]
+                continue
+            stack[-1] = (state, tick, choice + 1, saved, length)
+
+            pressed = choice == 1  # Primero se prueba sin saltar
+            if pressed and not self._matters(state):
+                continue
+            # Los estados en los que saltar no cambia nada se siguen aquí mismo, sin apilarlos
+            chain = []
+            moves = [pressed]
+            new, running = self._step(state, tick, pressed)
+            while True:
+                if new[8]:  # win (ver Body.snapshot)
+                    return self._won(keys + chain, bits + [pressed] + [False] * len(chain), inputs + moves)
+                if not running:
+                    if self.sim.body.rect.left >= self.sim.width and not (self.sim.body.died or self.sim.fell):
+                        self.off_edge = True
+                    else:
+                        self.furthest = max(self.furthest, self.sim.body.rect.left // TILE)
+                    break
+
+                new_key = _key(new)
+                if new_key in self.policy:
+                    return self._won(keys + chain, bits + [pressed] + [False] * len(chain), inputs + moves, new,
+                                     tick + len(moves))
+                if new_key in self.visited:
+                    break
+                self.states += 1
+                if self.states > self.max_states:
+                    return None
+                if self.deadline is not None and time.perf_counter() > self.deadline:
+                    self.timed_out = True
+                    return None
+                self.visited.add(new_key)
+                self.furthest = max(self.furthest, new[0] // TILE)
+                if self._matters(new):
+                    stack.append((new, tick + len(moves), 0, len(keys), len(inputs)))
+                    keys += chain + [new_key]
+                    bits += [pressed] + [False] * len(chain)
+                    inputs += moves
+                    break
+                chain.append(new_key)
+                new, running, steps = self._fly(new, tick + len(moves))
+                moves += [False] * steps
+                self.states += steps - 1
+        return None
+
+    def solve(self):
+        """
+        Busca una secuencia que complete el nivel desde el inicio
+        :return: diccionario con el resultado; inputs es la secuencia ganadora (o None). Si no se gana,
+        furthest_column es la columna más lejana a la que llega alguna secuencia: ahí muere la última rama y ninguna
+        pasa de ella, o, si se acabaron los estados o el tiempo (exhausted), hasta dónde se alcanzó a explorar. Es
+        None si se gana, si el nivel no tiene End o si se llega al borde derecho sin tocarlo (has_end y off_edge)
+        """
+        start = time.perf_counter()
+        if self.max_seconds is not None:
+            self.deadline = start + self.max_seconds
+        has_end = bool((to_kinds(self.level) == END).any())
+        self.sim.reset()
+        self.sim.body = _Probe(self.sim.start, self.sim.grid)
+        inputs = self.search(self.sim.body.snapshot()) if has_end else None
+        result = {
+            "solvable": inputs is not None,
+            "inputs": inputs,
+            "has_end": has_end,
+            "off_edge": self.off_edge,
+            "furthest_column": None if inputs is not None or not has_end or self.off_edge else self.furthest,
+            "states": self.states,
+            "exhausted": self.states > self.max_states or self.timed_out,
+            "seconds": time.perf_counter() - start,
+        }
+        if inputs is not None:
+            # Vuelve a jugar la secuencia con la simulación normal (monedas incluidas)
+            result["coins"] = Simulation(self.level).run(inputs)["coins"]
+        return result
+
+    def windows(self, inputs):
+        """
+        Ventanas de salto a lo largo de una secuencia ganadora: para cada paso, si saltar (o no saltar) también
+        permite ganar.
+        :param inputs: secuencia ganadora (de solve)
+        :return: lista de (primer paso, último paso, columna inicial, columna final, "jump" | "either")
+        de los tramos en que se puede saltar; "jump" significa que hay que saltar
+        """
+        self.sim.reset()
+        self.sim.body = _Probe(self.sim.start, self.sim.grid)
+        state = self.sim.body.snapshot()
+        options = []
+        for tick, pressed in enumerate(inputs):
+            if self._matters(state):
+                new, running = self._step(state, tick, not pressed)
+                other = new[8] or (running and self.search(new, tick + 1) is not None)
+            else:
+                other = True  # Saltar o no da lo mismo
+            column = state[0] // TILE
+            if pressed:
+                options.append((tick, column, "either" if other else "jump"))
+            elif other:
+                options.append((tick, column, "either"))
+            state, _ = self._step(state, tick, pressed)
+
+        windows = []
+        for tick, column, kind in options:
+            if windows and windows[-1][1] == tick - 1 and windows[-1][4] == kind:
+                windows[-1] = (windows[-1][0], tick, windows[-1][2], column, kind)
+            else:
+                windows.append((tick, tick, column, column, kind))
+        return windows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica si los niveles se pueden completar")
+    parser.add_argument("levels", nargs="+", help="archivos CSV de los niveles")
+    parser.add_argument("--windows", action="store_true", help="muestra los tramos en que se puede saltar")
+    parser.add_argument("--max-states", type=int, default=MAX_STATES, help="límite de estados por nivel")
+    parser.add_argument("--max-seconds", type=float, default=MAX_SECONDS, help="límite de tiempo por nivel")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for path in args.levels:
+        solver = Solver(load_level(path), args.max_states, args.max_seconds)
+        result = solver.solve()
+        if result["solvable"]:
+            witness = "".join("1" if bit else "0" for bit in result["inputs"])
+            print(f"{path}: se puede completar en {len(result['inputs'])} pasos, {result['coins']} monedas "
+                  f"({result['states']} estados, {result['seconds']:.2f} s)")
+            print(f"  saltos: {witness}")
+            if args.windows:
+                for first, last, col_first, col_last, kind in solver.windows(result["inputs"]):
+                    need = "hay que saltar" if kind == "jump" else "se puede saltar"
+                    print(f"  pasos {first}-{last} (columnas {col_first}-{col_last}): {need}")
+        else:
+            failed = True
+            if not result["has_end"]:
+                reason = "el nivel no tiene End"
+            elif result["off_edge"]:
+                reason = "se llega al final del nivel sin tocar el End"
+            elif result["exhausted"]:
+                reason = f"se acabaron los estados o el tiempo; explorado hasta la columna {result['furthest_column']}"
+            else:
+                reason = f"muerte inevitable; ninguna secuencia pasa de la columna {result['furthest_column']}"
+            print(f"{path}: NO se puede completar; {reason} ({result['states']} estados, {result['seconds']:.2f} s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
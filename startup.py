@@ -0,0 +1,95 @@
+"""
+Arranque del juego.
+
+Leer las fuentes del sistema (SysFont) y abrir el dispositivo de audio pueden tardar bastante más que todo lo demás,
+y no hacen falta para cargar las imágenes y el nivel. Background corre esas tareas en un hilo mientras el juego
+sigue cargando, y result() espera solo en el momento en que se necesitan.
+
+StartupTimer marca cuánto tardó cada fase del arranque, hasta el primer fotograma en pantalla:
+
+    startup = StartupTimer()
+    font = startup.background("fuente", pygame.font.SysFont, "lucidaconsole", 20)
+    ...
+    startup.mark("imágenes")
+    ...
+    startup.first_frame()
+    print(startup.report())
+"""
+import threading
+from time import perf_counter
+
+
+class Background:
+    """Una función que corre en un hilo; result() espera a que termine y devuelve lo que devolvió"""
+
+    def __init__(self, function, *args, name=None):
+        self._value = None
+        self._error = None
+        self.seconds = 0.0  # Lo que tardó la tarea
+        self.thread = threading.Thread(target=self._run, args=(function, args), name=name, daemon=True)
+        self.thread.start()
+
+    def _run(self, function, args):
+        start = perf_counter()
+        try:
+            self._value = function(*args)
+        except Exception as error:  # Se lanza de nuevo en result(), en el hilo que lo necesita
+            self._error = error
+        self.seconds = perf_counter() - start
+
+    def done(self):
+        return not self.thread.is_alive()
+
+    def result(self):
+        """Espera a que termine la tarea y devuelve su resultado (o lanza su excepción)"""
+        self.thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class StartupTimer:
+    """Tiempo de cada fase del arranque y tiempo hasta el primer fotograma"""
+
+    def __init__(self, start=None):
+        """
+        :param start: momento (perf_counter) en que empezó el arranque; por defecto, ahora
+        """
+        self.start = perf_counter() if start is None else start
+        self.phases = []  # (fase, segundos desde la marca anterior)
+        self.frame = None  # Segundos hasta el primer fotograma, o None si todavía no se dibujó
+        self.tasks = {}  # nombre -> Background, para el informe
+        self._last = self.start
+
+    def background(self, name, function, *args):
+        """Corre una tarea del arranque en otro hilo (ver Background)"""
+        task = self.tasks[name] = Background(function, *args, name=name)
+        return task
+
+    def mark(self, phase):
+        """Termina una fase: el tiempo desde la marca anterior es de esta fase"""
+        now = perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def first_frame(self):
+        """Marca el primer fotograma (las siguientes llamadas no hacen nada)"""
+        if self.frame is None:
+            self.mark("primer fotograma")
+            self.frame = self._last - self.start
+
+    def stats(self):
+        """Milisegundos por fase, por tarea en otro hilo y hasta el primer fotograma"""
+        stats = {phase: seconds * 1000 for phase, seconds in self.phases}
+        stats.update({f"{name}_thread": task.seconds * 1000 for name, task in self.tasks.items()})
+        stats["first_frame_ms"] = self.frame * 1000 if self.frame is not None else None
+        return stats
+
+    def report(self):
+        """Resumen como texto, una fase por línea, más lo que tardó cada tarea en su hilo"""
+        lines = [f"{phase:<18}{seconds * 1000:8.1f} ms" for phase, seconds in self.phases]
+        for name, task in self.tasks.items():
+            lines.append(f"{name + ' (hilo)':<18}{task.seconds * 1000:8.1f} ms")
+        if self.frame is not None:
+            lines.append(f"{'hasta el fotograma':<18}{self.frame * 1000:8.1f} ms")
+        return "\n".join(lines)
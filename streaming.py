@@ -0,0 +1,96 @@
+"""
+Carga del nivel por columnas.
+
+Para niveles muy largos no conviene crear un sprite por casilla al empezar. Aquí solo existen los obstáculos de las
+columnas cercanas a la cámara: las columnas se leen del arreglo del nivel (mapeado en memoria, ver levels.py) a
+medida que la cámara se acerca, y las que quedaron atrás se descartan. La memoria y el tiempo de carga dependen del
+ancho de la pantalla, no del largo del nivel.
+
+Cada obstáculo se indexa en la cuadrícula con el orden que tendría si se hubiera creado todo el nivel fila por fila
+(como init_level), así que las colisiones dan exactamente lo mismo.
+"""
+from collections import deque
+
+import numpy as np
+import pygame
+
+from sim import TILE
+
+
+class LevelStream:
+    """Ventana de columnas del nivel con sus obstáculos creados, que avanza con la cámara"""
+
+    def __init__(self, kinds, spawn, grid, ahead=4, behind=8, batch=16):
+        """
+        :param kinds: arreglo (filas, columnas) de tipos de casilla, como lo devuelve levels.load_level
+        :param spawn: función (tipo, (x, y)) -> sprite que crea un obstáculo
+        :param grid: cuadrícula (TileGrid) donde se indexan los obstáculos creados
+        :param ahead: columnas que se cargan más allá del borde derecho de la vista
+        :param behind: columnas que se conservan detrás del borde izquierdo (End mide casi 4 columnas)
+        :param batch: mínimo de columnas que se leen de una vez
+        """
+        self.kinds = kinds
+        self.spawn = spawn
+        self.grid = grid
+        self.ahead = ahead
+        self.behind = behind
+        self.batch = batch
+        self.columns = deque()  # (columna, [(sprite, rectángulo con el que se indexó)]), de first a last - 1
+        self.first = 0  # Primera columna cargada
+        self.last = 0  # Columna siguiente a la última cargada
+        self.live = 0  # Obstáculos creados que siguen en la ventana
+        self.created = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return self.live
+
+    def update(self, view):
+        """
+        Carga las columnas que se acercan a la vista y descarta las que quedaron atrás
+        :param view: rectángulo visible en coordenadas del mundo (Camera.view)
+        """
+        cols = self.kinds.shape[1]
+        need = min(cols, (view.right - 1) // TILE + 1 + self.ahead)
+        if need > self.last:
+            self._load(self.last, min(cols, max(need, self.last + self.batch)))
+
+        keep = view.left // TILE - self.behind
+        while self.columns and self.columns[0][0] < keep:
+            self._evict()
+
+    def _load(self, start, end):
+        """Crea los obstáculos de las columnas start a end - 1"""
+        width = self.kinds.shape[1]
+        block = np.asarray(self.kinds[:, start:end]).T  # (columnas, filas): se recorre columna por columna
+        cols, rows = block.nonzero()
+        entries = {col: [] for col in range(start, end)}
+        for col, row, kind in zip((cols + start).tolist(), rows.tolist(), block[cols, rows].tolist()):
+            sprite = self.spawn(kind, (col * TILE, row * TILE))
+            rect = pygame.Rect(sprite.rect)
+            self.grid.insert(sprite, rect, row * width + col)
+            entries[col].append((sprite, rect))
+        self.columns.extend(entries.items())
+        self.live += len(cols)
+        self.created += len(cols)
+        self.last = end
+
+    def _evict(self):
+        """Descarta la primera columna cargada"""
+        col, entries = self.columns.popleft()
+        for sprite, rect in entries:
+            self.grid.remove(sprite, rect)
+            sprite.kill()
+        self.live -= len(entries)
+        self.evicted += len(entries)
+        self.first = col + 1
+
+    def reset(self):
+        """Descarta todas las columnas, para volver a cargar desde el principio del nivel"""
+        while self.columns:
+            self._evict()
+        self.first = self.last = 0
+
+    def stats(self):
+        """Columnas cargadas y obstáculos creados, vivos y descartados"""
+        return {"columns": len(self.columns), "live": self.live, "created": self.created, "evicted": self.evicted}
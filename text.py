@@ -0,0 +1,57 @@
+"""
+Caché de textos y colores.
+
+font.render dibuja el texto de nuevo en cada llamada, aunque sea el mismo de siempre (el contador de intentos, los
+textos de la pantalla de inicio). Aquí cada texto se dibuja una sola vez por (texto, suavizado, color, fuente) y se
+reutiliza; los que no se usan hace tiempo se descartan cuando se llena la caché. Los colores con nombre
+(pygame.Color("red")) también se crean una sola vez.
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """Superficies de texto ya dibujadas, con descarte de las menos usadas"""
+
+    def __init__(self, capacity=128):
+        """
+        :param capacity: máximo de textos guardados
+        """
+        self.capacity = capacity
+        self.surfaces = OrderedDict()  # (texto, suavizado, color, fondo, fuente) -> superficie, de la menos usada
+        self.colors = {}  # nombre -> pygame.Color
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        """
+        Igual que font.render, pero cada texto distinto se dibuja una sola vez
+        :return: superficie del texto (compartida: no se debe dibujar encima de ella)
+        """
+        key = (text, antialias, tuple(color), background if background is None else tuple(background), font)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color, background)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def color(self, name):
+        """pygame.Color con nombre, creado una sola vez"""
+        color = self.colors.get(name)
+        if color is None:
+            color = self.colors[name] = pygame.Color(name)
+        return color
+
+    def stats(self):
+        """Cuenta de aciertos, fallos y descartes"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "texts": len(self.surfaces)}
@@ -0,0 +1,90 @@
+"""
+Paso fijo de la física.
+
+El juego original avanzaba un paso de física por fotograma y después esperaba con clock.tick(60): si la máquina no
+alcanzaba los 60 FPS, todo el juego se volvía más lento. Aquí el tiempo real entre fotogramas se acumula y se gasta
+en pasos de duración fija: a 30 FPS se dan dos pasos por fotograma, a 144 FPS a veces ninguno, y la partida es la
+misma con los mismos saltos. Lo que queda en el acumulador (alpha, de 0 a 1) dice qué parte del paso siguiente ya
+pasó, para dibujar en un punto intermedio entre el estado anterior y el actual.
+
+Si un fotograma tarda demasiado (la ventana se arrastró, la máquina se trabó) no se recupera todo el tiempo perdido:
+se dan como máximo max_steps pasos y el resto se descarta. Si no, cada fotograma lento tendría que simular más pasos,
+que lo harían todavía más lento.
+
+    timestep = FixedTimestep(60)
+    while jugando:
+        timestep.advance()
+        while timestep.due():
+            paso()
+        dibujar(timestep.alpha)
+"""
+from time import perf_counter
+
+
+def interpolate(previous, current, alpha):
+    """Valor intermedio entre el del paso anterior y el del actual"""
+    return previous + (current - previous) * alpha
+
+
+class FixedTimestep:
+    """Acumulador de tiempo real que se gasta en pasos de física de duración fija"""
+
+    def __init__(self, rate=60, max_steps=5):
+        """
+        :param rate: pasos por segundo; 0 da un paso por fotograma, sin importar el tiempo (lo más rápido posible)
+        :param max_steps: pasos por fotograma como máximo
+        """
+        self.rate = rate
+        self.step = 1 / rate if rate else 0.0
+        self.max_steps = max_steps
+        self.accumulator = 0.0  # Segundos todavía sin simular
+        self.last = perf_counter()
+        self.pending = 0  # Pasos que faltan dar en este fotograma
+        self.steps = 0  # Pasos dados en total
+        self.dropped = 0  # Pasos descartados por el máximo por fotograma
+
+    def reset(self):
+        """Empieza a contar de nuevo (al empezar un intento), sin pasos pendientes: el tiempo en las pantallas de
+        espera no se simula"""
+        self.last = perf_counter()
+        self.accumulator = 0.0
+        self.pending = 0
+
+    def advance(self):
+        """Suma el tiempo que pasó desde el fotograma anterior y calcula los pasos de este fotograma"""
+        now = perf_counter()
+        if not self.rate:
+            self.last = now
+            self.pending = 1
+            return
+        self.accumulator += now - self.last
+        self.last = now
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            self.dropped += steps - self.max_steps
+            self.accumulator -= (steps - self.max_steps) * self.step
+            steps = self.max_steps
+        self.pending = steps
+
+    def due(self):
+        """
+        Consume un paso del fotograma
+        :return: True si hay que dar otro paso
+        """
+        if self.pending <= 0:
+            return False
+        self.pending -= 1
+        self.accumulator -= self.step
+        self.steps += 1
+        return True
+
+    @property
+    def alpha(self):
+        """Parte del paso siguiente que ya pasó (0 a 1), para dibujar entre el estado anterior y el actual"""
+        if not self.rate:
+            return 1.0
+        return min(max(self.accumulator / self.step, 0.0), 1.0)
+
+    def stats(self):
+        """Pasos dados y descartados"""
+        return {"steps": self.steps, "dropped": self.dropped}
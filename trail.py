@@ -0,0 +1,52 @@
+"""
+Capa con alfa del rastro del jugador y de los destellos de los orbes.
+
+El juego original multiplicaba el alfa de toda la superficie (800x600) en cada fotograma para desvanecer el rastro,
+y después la dibujaba completa sobre la pantalla, aunque el rastro ocupe una franja pequeña detrás del jugador.
+Aquí se anotan las áreas en las que se dibujó: solo esas se desvanecen en el fotograma siguiente y solo esas se
+dibujan sobre la pantalla.
+
+Multiplicar el alfa por 1/255 deja cualquier píxel en alfa 0 o 1 en un solo fotograma, así que lo que queda fuera
+de las áreas anotadas ya es invisible (a lo sumo 1/255 de diferencia de color).
+"""
+import pygame
+
+FADE = (255, 255, 255, 1)  # Multiplicador del desvanecimiento (alfa * 1/255)
+
+
+class TrailLayer:
+    """Superficie con alfa que se desvanece en cada fotograma"""
+
+    def __init__(self, size, bounded=True):
+        """
+        :param size: tamaño de la pantalla (ancho, alto)
+        :param bounded: si es False, se desvanece y se dibuja la superficie completa, como el juego original
+        """
+        self.surf = pygame.Surface(size, pygame.SRCALPHA)
+        self.rect = self.surf.get_rect()
+        self.bounded = bounded
+        self.areas = []  # Áreas dibujadas en este fotograma
+
+    def mark(self, rect):
+        """Anota un área en la que se dibujó sobre la superficie (por ejemplo, lo que devuelve pygame.draw)"""
+        if rect is not None:
+            self.areas.append(self.rect.clip(rect))
+        return rect
+
+    def fade(self):
+        """Desvanece lo dibujado en el fotograma anterior"""
+        if self.bounded:
+            for area in self.areas:
+                self.surf.fill(FADE, area, special_flags=pygame.BLEND_RGBA_MULT)
+        else:
+            self.surf.fill(FADE, special_flags=pygame.BLEND_RGBA_MULT)
+        self.areas = []
+
+    def composite(self, surf):
+        """
+        Dibuja la capa sobre la pantalla
+        :return: rectángulos de pantalla en los que se dibujó
+        """
+        if self.bounded:
+            return surf.blits([(self.surf, area, area) for area in self.areas])
+        return [surf.blit(self.surf, (0, 0))]